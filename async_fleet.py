@@ -0,0 +1,201 @@
+import asyncio
+import os
+import time
+from http import HTTPStatus
+
+import aiohttp
+from telebot.async_telebot import AsyncTeleBot
+from telebot.asyncio_helper import ApiException
+
+import metrics
+from changes import ChangeDetector
+from circuit_breaker import CircuitBreaker, RateLimits
+from exceptions import ApiIsDown, ApiRateLimited, CantSendMessage, NoTokenEnv
+from fleet import (SUBSCRIBERS_FILE, SubscriptionRegistry,
+                   restore_subscriptions, save_subscription)
+from homework import (API_CONNECT_TIMEOUT, API_READ_TIMEOUT, ENDPOINT,
+                      RETRY_PERIOD, TELEGRAM_TOKEN, api_status_error,
+                      check_response, join_messages, logger, make_headers,
+                      parse_statuses, use_telegram_api)
+from json_decoder import decode_api_response
+from scheduler import make_policy
+from sharding import SHARD_COUNT, SHARD_INDEX, select_shard
+from state import StateStore, owner_key
+
+API_CONCURRENCY = int(os.getenv('API_CONCURRENCY', 100))
+SEND_CONCURRENCY = int(os.getenv('SEND_CONCURRENCY', 20))
+API_CLIENT_TIMEOUT = aiohttp.ClientTimeout(
+    sock_connect=API_CONNECT_TIMEOUT, sock_read=API_READ_TIMEOUT
+)
+
+
+async def get_api_answer_async(session, headers, timestamp):
+    """Асинхронно получить ответ от api-сервиса."""
+    logger.debug(
+        'Начало отправки запроса к API-сервису %s, с параметрами %s.',
+        ENDPOINT, timestamp
+    )
+    started = time.monotonic()
+    try:
+        async with session.get(
+                ENDPOINT, params={'from_date': timestamp}, headers=headers,
+                timeout=API_CLIENT_TIMEOUT
+        ) as response:
+            metrics.API_RESPONSES.inc(code=response.status)
+            if response.status != HTTPStatus.OK:
+                raise api_status_error(response.status, response)
+            return decode_api_response(await response.read())
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        metrics.API_RESPONSES.inc(code='error')
+        raise ApiIsDown('Api-сервис недоступен.')
+    finally:
+        metrics.API_REQUEST_SECONDS.observe(time.monotonic() - started)
+
+
+async def send_message_async(bot, chat_id, message):
+    """Асинхронная отправка сообщения в чат телеграма."""
+    try:
+        logger.debug('Начало отправки сообщения "%s"', message)
+        await bot.send_message(chat_id=chat_id, text=message)
+        logger.debug('Удачная отправка сообщения "%s"', message)
+    except (ApiException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        metrics.MESSAGES_FAILED.inc()
+        raise CantSendMessage(f'Не переслано сообщение {message}. Ошибка: {e}')
+    metrics.MESSAGES_SENT.inc()
+    return True
+
+
+class AsyncFleetPoller:
+    """Опрос всех подписок реестра в одном цикле событий."""
+
+    def __init__(self, bot, session, registry, period=RETRY_PERIOD,
+                 api_concurrency=API_CONCURRENCY,
+                 send_concurrency=SEND_CONCURRENCY, store=None, policy=None,
+                 breaker=None, detector=None):
+        self.bot = bot
+        self.session = session
+        self.registry = registry
+        self.period = period
+        self.policy = policy if policy is not None else make_policy(period)
+        self.breaker = (
+            breaker if breaker is not None
+            else CircuitBreaker(trip_on_rate_limit=False)
+        )
+        self.rate_limits = RateLimits()
+        self.store = store if store is not None else StateStore()
+        self.detector = (
+            detector if detector is not None else ChangeDetector(self.store)
+        )
+        self._api_limit = asyncio.Semaphore(api_concurrency)
+        self._send_limit = asyncio.Semaphore(send_concurrency)
+
+    async def fetch(self, subscription):
+        """Запрос к api-сервису с ограничением числа одновременных."""
+        self.rate_limits.check(subscription.token)
+        async with self._api_limit:
+            try:
+                return await self.breaker.call_async(
+                    get_api_answer_async, self.session,
+                    make_headers(subscription.token), subscription.timestamp
+                )
+            except ApiRateLimited as error:
+                self.rate_limits.record(subscription.token, error.retry_after)
+                raise
+
+    async def send(self, subscription, message):
+        """Отправка сообщения с ограничением числа одновременных."""
+        async with self._send_limit:
+            return await send_message_async(
+                self.bot, subscription.chat_id, message
+            )
+
+    async def poll(self, subscription):
+        """Опрашивает api-сервис для одной подписки.
+
+        Обращения к хранилищу (SQLite с fsync) выполняются в потоках
+        asyncio.to_thread, чтобы не останавливать цикл событий.
+        """
+        owner = owner_key(subscription.token)
+        try:
+            api_response = await self.fetch(subscription)
+            homeworks_lst = check_response(api_response)
+            subscription.observe(homeworks_lst)
+            if homeworks_lst:
+                changed = await asyncio.to_thread(
+                    self.detector.changes, owner, homeworks_lst
+                )
+                for text in join_messages(
+                        parse_statuses(changed, subscription.errors.record)):
+                    await self.send(subscription, text)
+                await asyncio.to_thread(self.detector.commit, owner, changed)
+                subscription.timestamp = api_response.get(
+                    'current_date', subscription.timestamp
+                )
+            else:
+                logger.debug('Нет новых домашних работ с прошлого запроса.')
+        except CantSendMessage as error:
+            logger.error(error, exc_info=True)
+            metrics.ERRORS.inc(exception=type(error).__name__)
+        except Exception as error:
+            logger.error(error, exc_info=True)
+            metrics.ERRORS.inc(exception=type(error).__name__)
+            subscription.errors.record(error)
+        for message in subscription.errors.pending():
+            try:
+                await self.send(subscription, message)
+            except CantSendMessage as send_error:
+                logger.error(send_error, exc_info=True)
+        await asyncio.to_thread(save_subscription, self.store, subscription)
+
+    async def run_cycle(self):
+        """Один проход по всем подпискам."""
+        await asyncio.gather(
+            *(self.poll(subscription) for subscription in self.registry)
+        )
+
+    async def poll_forever(self, subscription, offset):
+        """Опрос одной подписки с паузами по политике планировщика."""
+        await asyncio.sleep(offset)
+        while True:
+            await self.poll(subscription)
+            await asyncio.sleep(self.policy.next_delay(subscription))
+
+    async def run_forever(self):
+        """Бесконечный опрос всех подписок, распределённый по периоду."""
+        step = self.period / max(len(self.registry), 1)
+        await asyncio.gather(*(
+            self.poll_forever(subscription, index * step)
+            for index, subscription in enumerate(self.registry)
+        ))
+
+
+async def run(registry, store):
+    """Запуск асинхронного опроса для реестра подписок."""
+    use_telegram_api()
+    bot = AsyncTeleBot(token=TELEGRAM_TOKEN)
+    connector = aiohttp.TCPConnector(limit=API_CONCURRENCY)
+    try:
+        async with aiohttp.ClientSession(connector=connector) as session:
+            await AsyncFleetPoller(
+                bot, session, registry, store=store
+            ).run_forever()
+    finally:
+        await bot.close_session()
+
+
+def main():
+    """Асинхронный опрос api-сервиса для подписчиков из SUBSCRIBERS_FILE."""
+    if not TELEGRAM_TOKEN:
+        logger.critical('для работы бота не хватает токена TELEGRAM_TOKEN')
+        raise NoTokenEnv('Не хватает переменных окружения.')
+    registry = select_shard(SubscriptionRegistry.from_file(SUBSCRIBERS_FILE))
+    logger.debug('Загружено подписок: %s (шард %s из %s)',
+                 len(registry), SHARD_INDEX, SHARD_COUNT)
+    store = StateStore()
+    restore_subscriptions(registry, store)
+    metrics.start_exporter()
+    asyncio.run(run(registry, store))
+
+
+if __name__ == '__main__':
+    main()
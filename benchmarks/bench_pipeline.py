@@ -0,0 +1,220 @@
+"""Замеры конвейера опрос -> проверка -> разбор -> отправка.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --sizes 1 100 10000 --subscribers 5000
+
+Вместо сети используются заглушки MockResponseGET и MockTelegramBot
+из tests/check_utils.py.
+"""
+import argparse
+import json
+import logging
+import time
+import tracemalloc
+
+import requests
+
+import fleet
+import homework
+from state import StateStore
+from tests.check_utils import MockResponseGET, MockTelegramBot
+
+STATUSES = tuple(homework.HOMEWORK_VERDICTS)
+
+
+def make_api_response(size, current_date=1000198000, shift=0):
+    """Синтетический ответ api-сервиса с size работами.
+
+    shift сдвигает статусы по кругу: ответы с разным shift отличаются
+    статусом каждой работы.
+    """
+    return {
+        'homeworks': [
+            {
+                'id': index,
+                'homework_name': f'username__hw{index}.zip',
+                'status': STATUSES[(index + shift) % len(STATUSES)],
+                'reviewer_comment': 'Принято!',
+                'date_updated': '2021-04-11T10:31:09Z',
+                'lesson_name': f'Проект спринта {index}',
+            }
+            for index in range(size)
+        ],
+        'current_date': current_date,
+    }
+
+
+class MockResponseWithBody(MockResponseGET):
+    """MockResponseGET с телом и заголовками, как у requests.Response."""
+
+    def __init__(self, *args, body=b'', **kwargs):
+        super().__init__(*args, **kwargs)
+        self.content = body
+        self.headers = {}
+
+
+def mock_get(data):
+    """Заменитель requests.get, всегда отвечающий data."""
+    body = json.dumps(data).encode()
+
+    def get(*args, **kwargs):
+        return MockResponseWithBody(*args, data=data, body=body, **kwargs)
+    return get
+
+
+def percentile(samples, fraction):
+    """Перцентиль по отсортированным замерам."""
+    index = min(int(len(samples) * fraction), len(samples) - 1)
+    return samples[index]
+
+
+def measure(func, repeats):
+    """Время каждого из repeats вызовов и пик памяти одного вызова."""
+    func()
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    timings.sort()
+    return {
+        'calls_per_sec': len(timings) / sum(timings),
+        'p50_ms': percentile(timings, 0.5) * 1000,
+        'p99_ms': percentile(timings, 0.99) * 1000,
+        'peak_kib': (peak - before) / 1024,
+    }
+
+
+def pipeline_stages(size):
+    """Отдельные шаги и полный цикл для ответа с size работами."""
+    data = make_api_response(size)
+    homeworks = data['homeworks']
+    messages = homework.parse_statuses(homeworks)
+    bot = MockTelegramBot()
+    requests.get = mock_get(data)
+
+    def full_cycle():
+        api_response = homework.get_api_answer(0)
+        homeworks_lst = homework.check_response(api_response)
+        for text in homework.join_messages(
+                homework.parse_statuses(homeworks_lst)):
+            homework.send_message(bot, text)
+
+    return {
+        'get_api_answer': lambda: homework.get_api_answer(0),
+        'check_response': lambda: homework.check_response(data),
+        'parse_statuses': lambda: homework.parse_statuses(homeworks),
+        'join_messages': lambda: homework.join_messages(messages),
+        'send_message': lambda: homework.send_message(bot, messages[0]),
+        'full_cycle': full_cycle,
+    }
+
+
+def fleet_cycle(subscribers, size, changing=True):
+    """Один проход FleetPoller по subscribers подпискам.
+
+    С changing каждый проход отдаёт новые current_date и статусы, так что
+    ответ разбирается заново, а по изменениям уходят сообщения. Без него
+    ответ всегда один и тот же: после первого прохода это попадание в
+    кэш ответов (same_body) без изменений статусов.
+    """
+    requests.get = mock_get(make_api_response(size))
+    registry = fleet.SubscriptionRegistry()
+    for index in range(subscribers):
+        registry.add(f'token{index}', index, timestamp=0)
+    poller = fleet.FleetPoller(
+        MockTelegramBot(), registry, session=requests,
+        store=StateStore(':memory:')
+    )
+    passes = 0
+
+    def cycle():
+        nonlocal passes
+        passes += 1
+        if changing:
+            requests.get = mock_get(
+                make_api_response(size, 1000198000 + passes, shift=passes)
+            )
+        for subscription in registry:
+            poller.poll(subscription)
+
+    return cycle
+
+
+def run(sizes, subscribers, repeats):
+    """Все замеры; результат - список строк отчёта."""
+    original_get = requests.get
+    results = []
+    try:
+        for size in sizes:
+            for stage, func in pipeline_stages(size).items():
+                results.append(
+                    dict(stage=stage, homeworks=size, subscribers=1,
+                         **measure(func, repeats))
+                )
+        for size in (0, 1):
+            for stage, changing in (('fleet_cycle', True),
+                                    ('fleet_cache_hit', False)):
+                cycle = fleet_cycle(subscribers, size, changing)
+                results.append(
+                    dict(stage=stage, homeworks=size,
+                         subscribers=subscribers,
+                         **measure(cycle, max(repeats // 100, 3)))
+                )
+    finally:
+        requests.get = original_get
+    return results
+
+
+def print_report(results):
+    """Таблица с результатами замеров."""
+    header = (
+        f'{"stage":<16}{"homeworks":>10}{"subscr.":>9}'
+        f'{"calls/s":>12}{"p50 ms":>10}{"p99 ms":>10}{"peak KiB":>11}'
+    )
+    print(header)
+    print('-' * len(header))
+    for row in results:
+        print(
+            f'{row["stage"]:<16}{row["homeworks"]:>10}'
+            f'{row["subscribers"]:>9}{row["calls_per_sec"]:>12.1f}'
+            f'{row["p50_ms"]:>10.3f}{row["p99_ms"]:>10.3f}'
+            f'{row["peak_kib"]:>11.1f}'
+        )
+
+
+def main():
+    """Разбор аргументов командной строки и запуск замеров."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[1, 10, 100, 1000, 10000],
+        help='число работ в ответе api-сервиса'
+    )
+    parser.add_argument('--subscribers', type=int, default=1000)
+    parser.add_argument('--repeats', type=int, default=200)
+    parser.add_argument(
+        '--log-level', default='WARNING',
+        help='уровень логгера homework во время замеров'
+    )
+    parser.add_argument('--json', help='файл для результатов в json')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+    homework.logger.setLevel(args.log_level)
+    results = run(args.sizes, args.subscribers, args.repeats)
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
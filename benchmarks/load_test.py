@@ -0,0 +1,155 @@
+"""Нагрузочный прогон FleetPoller через локальные заменители сервисов.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.load_test --subscribers 1000 --duration 30
+    python -m benchmarks.load_test --threads 16 --latency 0.2 \\
+        --error-rate 0.05 --rate-limit-rate 0.02 --telegram-rate 30
+
+Api-сервис и телеграм заменяются серверами из benchmarks.standins, так что
+запросы проходят через настоящие сокеты, пул соединений http_client,
+пул потоков опроса и очередь отправки telegram_queue.
+"""
+import argparse
+import json
+import logging
+import time
+
+from telebot import TeleBot, apihelper
+
+import fleet
+import homework
+import metrics
+from benchmarks import standins
+from http_client import create_session
+from state import StateStore
+from telegram_queue import TELEGRAM_GLOBAL_RATE, SendQueue
+
+STANDIN_TELEGRAM_TOKEN = '0:standin'
+
+
+def point_at(practicum, telegram):
+    """Направляет бота на заменители; прежние адреса."""
+    previous = homework.ENDPOINT, apihelper.API_URL
+    homework.ENDPOINT = practicum.endpoint
+    homework.use_telegram_api(telegram.url)
+    return previous
+
+
+def make_poller(subscribers, period, threads, global_rate):
+    """FleetPoller с subscribers подписками и очередью отправки."""
+    registry = fleet.SubscriptionRegistry()
+    for index in range(subscribers):
+        registry.add(f'token{index}', index + 1, timestamp=0)
+    bot = TeleBot(token=STANDIN_TELEGRAM_TOKEN)
+    outbox = SendQueue(bot, global_rate=global_rate).start()
+    session = create_session(pool_maxsize=max(threads, 1))
+    return fleet.FleetPoller(
+        bot, registry, period=period, session=session, outbox=outbox,
+        store=StateStore(':memory:'), threads=threads
+    )
+
+
+def drive(poller, duration):
+    """Опрос по расписанию в течение duration секунд."""
+    started = time.monotonic()
+    deadline = started + duration
+    poller.schedule_all(started)
+    while True:
+        delay = poller.run_pending()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(delay, remaining))
+    return time.monotonic() - started
+
+
+def codes(server, method):
+    """Число ответов сервера на method по кодам."""
+    return {
+        str(status): count
+        for (name, status), count in sorted(server.stats.items())
+        if name == method
+    }
+
+
+def run(args):
+    """Один прогон; результат - словарь отчёта."""
+    practicum, telegram = standins.start_servers(args)
+    previous = point_at(practicum, telegram)
+    overruns = metrics.CYCLE_OVERRUNS.value()
+    cancelled = metrics.POLLS_CANCELLED.value()
+    try:
+        poller = make_poller(
+            args.subscribers, args.period, args.threads, args.global_rate
+        )
+        try:
+            elapsed = drive(poller, args.duration)
+        finally:
+            poller.close()
+            unsent = poller.outbox.stop(args.drain)
+            poller.session.close()
+    finally:
+        homework.ENDPOINT, apihelper.API_URL = previous
+        practicum.stop()
+        telegram.stop()
+    api_requests = sum(codes(practicum, 'homework_statuses').values())
+    messages = codes(telegram, 'sendMessage')
+    return {
+        'subscribers': args.subscribers,
+        'threads': args.threads,
+        'elapsed_s': elapsed,
+        'api_requests': api_requests,
+        'api_per_sec': api_requests / elapsed,
+        'api_codes': codes(practicum, 'homework_statuses'),
+        'messages_sent': messages.get('200', 0),
+        'messages_per_sec': messages.get('200', 0) / elapsed,
+        'telegram_codes': messages,
+        'unsent': unsent,
+        'cycle_overruns': metrics.CYCLE_OVERRUNS.value() - overruns,
+        'polls_cancelled': metrics.POLLS_CANCELLED.value() - cancelled,
+    }
+
+
+def print_report(result):
+    """Результаты прогона по строке на показатель."""
+    for name, value in result.items():
+        if isinstance(value, float):
+            value = f'{value:.2f}'
+        print(f'{name:<18}{value}')
+
+
+def main():
+    """Разбор аргументов командной строки и запуск прогона."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    standins.add_arguments(parser)
+    parser.add_argument('--subscribers', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=30,
+                        help='длительность прогона, с')
+    parser.add_argument('--period', type=float, default=10,
+                        help='период опроса каждой подписки, с')
+    parser.add_argument('--threads', type=int, default=fleet.POLL_THREADS,
+                        help='потоков опроса (POLL_THREADS)')
+    parser.add_argument('--global-rate', type=float,
+                        default=TELEGRAM_GLOBAL_RATE,
+                        help='лимит очереди отправки, сообщений в секунду')
+    parser.add_argument('--drain', type=float, default=5,
+                        help='время на досылку очереди после прогона, с')
+    parser.add_argument(
+        '--log-level', default='CRITICAL',
+        help='уровень логгера homework во время прогона'
+    )
+    parser.add_argument('--json', help='файл для результатов в json')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.ERROR)
+    homework.logger.setLevel(args.log_level)
+    result = run(args)
+    print_report(result)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(result, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
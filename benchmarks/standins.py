@@ -0,0 +1,319 @@
+"""Локальные заменители api-сервиса практикума и Bot API телеграма.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.standins --latency 0.2 --error-rate 0.05
+    python -m benchmarks.standins --homeworks 10000 --telegram-rate 30
+
+Сервер печатает переменные окружения, с которыми homework.py, fleet.py
+и coordinator.py ходят в заменители вместо сети.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter, deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from benchmarks.bench_pipeline import STATUSES, make_api_response
+
+HOMEWORK_STATUSES_PATH = '/api/user_api/homework_statuses/'
+CURRENT_DATE_PLACEHOLDER = 1000198000
+POLL_INTERVAL = 0.05
+
+
+class Faults:
+    """Задержка и доли ответов с ошибкой 5xx и 429."""
+
+    def __init__(self, latency=0, error_rate=0, rate_limit_rate=0,
+                 retry_after=1):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+
+    def draw(self):
+        """Ждёт latency и выбирает исход: None, 'error' или 'rate_limit'."""
+        if self.latency:
+            time.sleep(self.latency)
+        roll = random.random()
+        if roll < self.error_rate:
+            return 'error'
+        if roll < self.error_rate + self.rate_limit_rate:
+            return 'rate_limit'
+        return None
+
+
+class StandinServer(ThreadingHTTPServer):
+    """Многопоточный http-сервер заменителя со счётчиком ответов."""
+
+    daemon_threads = True
+
+    def __init__(self, handler, faults=None, host='127.0.0.1', port=0):
+        super().__init__((host, port), handler)
+        self.faults = faults or Faults()
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def url(self):
+        """Адрес сервера."""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def count(self, method, status):
+        """Учитывает ответ на method с кодом status."""
+        with self._stats_lock:
+            self.stats[method, int(status)] += 1
+
+    def start(self):
+        """Запускает сервер в фоновом потоке."""
+        threading.Thread(
+            target=self.serve_forever, args=(POLL_INTERVAL,),
+            name=type(self).__name__, daemon=True
+        ).start()
+        return self
+
+    def stop(self):
+        """Останавливает сервер и закрывает сокет."""
+        self.shutdown()
+        self.server_close()
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Общая часть обработчиков: keep-alive, json и учёт ответов."""
+
+    protocol_version = 'HTTP/1.1'
+    method_name = 'request'
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body, headers=()):
+        """Ответ с телом body (bytes или объект для json)."""
+        if not isinstance(body, bytes):
+            body = json.dumps(body, ensure_ascii=False).encode()
+        self.server.count(self.method_name, status)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_params(self):
+        """Параметры из строки запроса и urlencoded-тела."""
+        params = dict(parse_qsl(urlsplit(self.path).query))
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        content_type = self.headers.get('Content-Type', '')
+        if body and content_type.startswith(
+                'application/x-www-form-urlencoded'):
+            params.update(parse_qsl(body.decode()))
+        return params
+
+
+class PracticumHandler(StandinHandler):
+    """GET homework_statuses: работы, изменившиеся с from_date.
+
+    На from_date=0 отдаются все работы сервера, на остальные -
+    с вероятностью change_rate одна работа с новым статусом.
+    """
+
+    method_name = 'homework_statuses'
+
+    def do_GET(self):
+        if urlsplit(self.path).path != HOMEWORK_STATUSES_PATH:
+            return self.send_json(HTTPStatus.NOT_FOUND, {'code': 'not_found'})
+        params = self.read_params()
+        if not self.headers.get('Authorization', '').startswith('OAuth '):
+            return self.send_json(
+                HTTPStatus.UNAUTHORIZED, {'code': 'not_authenticated'}
+            )
+        fault = self.server.faults.draw()
+        if fault == 'error':
+            return self.send_json(
+                HTTPStatus.INTERNAL_SERVER_ERROR, {'code': 'server_error'}
+            )
+        if fault == 'rate_limit':
+            return self.send_json(
+                HTTPStatus.TOO_MANY_REQUESTS, {'code': 'throttled'},
+                (('Retry-After', str(self.server.faults.retry_after)),)
+            )
+        self.send_json(
+            HTTPStatus.OK, self.server.body(params.get('from_date', '0'))
+        )
+
+
+class PracticumServer(StandinServer):
+    """Заменитель api-сервиса практикума."""
+
+    def __init__(self, faults=None, homeworks=3, change_rate=0.1, **kwargs):
+        super().__init__(PracticumHandler, faults, **kwargs)
+        self.change_rate = change_rate
+        self._full = json.dumps(
+            make_api_response(homeworks, CURRENT_DATE_PLACEHOLDER)
+        ).encode().split(str(CURRENT_DATE_PLACEHOLDER).encode())
+
+    @property
+    def endpoint(self):
+        """Значение PRACTICUM_ENDPOINT для этого сервера."""
+        return self.url + HOMEWORK_STATUSES_PATH
+
+    def body(self, from_date):
+        """Тело ответа; большой список работ сериализуется один раз."""
+        current_date = str(int(time.time())).encode()
+        if from_date in ('', '0'):
+            return current_date.join(self._full)
+        changed = []
+        if random.random() < self.change_rate:
+            changed = make_api_response(1)['homeworks']
+            changed[0]['status'] = random.choice(STATUSES)
+        return json.dumps({
+            'homeworks': changed, 'current_date': int(current_date)
+        }).encode()
+
+
+class TelegramHandler(StandinHandler):
+    """Методы Bot API: sendMessage, getMe и пустой getUpdates."""
+
+    def do_GET(self):
+        self.handle_method()
+
+    def do_POST(self):
+        self.handle_method()
+
+    def handle_method(self):
+        _, _, self.method_name = urlsplit(self.path).path.rpartition('/')
+        params = self.read_params()
+        if self.method_name == 'getMe':
+            return self.ok({
+                'id': 1, 'is_bot': True, 'first_name': 'standin',
+                'username': 'standin_bot'
+            })
+        if self.method_name == 'getUpdates':
+            time.sleep(min(float(params.get('timeout', 0)), 1))
+            return self.ok([])
+        if self.method_name != 'sendMessage':
+            return self.fail(HTTPStatus.NOT_FOUND, 'Not Found')
+        fault = self.server.faults.draw()
+        if fault == 'rate_limit' or not self.server.acquire():
+            return self.fail(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                'Too Many Requests: retry after '
+                f'{self.server.faults.retry_after}',
+                {'retry_after': self.server.faults.retry_after}
+            )
+        if fault == 'error':
+            return self.fail(
+                HTTPStatus.INTERNAL_SERVER_ERROR, 'Internal Server Error'
+            )
+        self.ok({
+            'message_id': self.server.next_message_id(),
+            'date': int(time.time()),
+            'chat': {'id': int(params.get('chat_id', 0)), 'type': 'private'},
+            'text': params.get('text', ''),
+        })
+
+    def ok(self, result):
+        """Успешный ответ Bot API."""
+        self.send_json(HTTPStatus.OK, {'ok': True, 'result': result})
+
+    def fail(self, status, description, parameters=None):
+        """Ответ Bot API с ошибкой."""
+        body = {'ok': False, 'error_code': int(status),
+                'description': description}
+        if parameters:
+            body['parameters'] = parameters
+        self.send_json(status, body)
+
+
+class TelegramServer(StandinServer):
+    """Заменитель Bot API с лимитом max_rate сообщений в секунду."""
+
+    def __init__(self, faults=None, max_rate=None, **kwargs):
+        super().__init__(TelegramHandler, faults, **kwargs)
+        self.max_rate = max_rate
+        self._sent = deque()
+        self._message_id = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """True, если сообщение укладывается в лимит за последнюю секунду."""
+        if not self.max_rate:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            while self._sent and now - self._sent[0] >= 1:
+                self._sent.popleft()
+            if len(self._sent) >= self.max_rate:
+                return False
+            self._sent.append(now)
+            return True
+
+    def next_message_id(self):
+        """Номер очередного сообщения."""
+        with self._lock:
+            self._message_id += 1
+            return self._message_id
+
+
+def add_arguments(parser):
+    """Параметры заменителей для командной строки."""
+    parser.add_argument('--latency', type=float, default=0,
+                        help='задержка ответа, с')
+    parser.add_argument('--error-rate', type=float, default=0,
+                        help='доля ответов 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0,
+                        help='доля ответов 429')
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--homeworks', type=int, default=3,
+                        help='число работ в полном ответе api-сервиса')
+    parser.add_argument('--change-rate', type=float, default=0.1,
+                        help='вероятность нового статуса в ответе')
+    parser.add_argument('--telegram-rate', type=float, default=None,
+                        help='лимит сообщений телеграма в секунду')
+
+
+def start_servers(args, practicum_port=0, telegram_port=0):
+    """Запускает оба заменителя с параметрами из args."""
+    faults = Faults(
+        args.latency, args.error_rate, args.rate_limit_rate, args.retry_after
+    )
+    practicum = PracticumServer(
+        faults, args.homeworks, args.change_rate, port=practicum_port
+    ).start()
+    telegram = TelegramServer(
+        faults, args.telegram_rate, port=telegram_port
+    ).start()
+    return practicum, telegram
+
+
+def main():
+    """Заменители работают до Ctrl+C."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument('--practicum-port', type=int, default=8090)
+    parser.add_argument('--telegram-port', type=int, default=8091)
+    args = parser.parse_args()
+    practicum, telegram = start_servers(
+        args, args.practicum_port, args.telegram_port
+    )
+    print(f'PRACTICUM_ENDPOINT={practicum.endpoint}')
+    print(f'TELEGRAM_API_URL={telegram.url}')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        practicum.stop()
+        telegram.stop()
+
+
+if __name__ == '__main__':
+    main()
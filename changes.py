@@ -0,0 +1,60 @@
+import threading
+
+from models import homework_key
+
+
+class ChangeDetector:
+    """Последние известные статусы работ по владельцу и ключу работы.
+
+    Новым считается статус, отличный от последнего известного: изменения
+    других полей и повторы работы в перекрывающихся ответах не дают
+    сообщений. Впервые увиденная работа считается изменением. С store
+    статусы читаются из StateStore при первом обращении и сохраняются в
+    него в commit.
+    """
+
+    def __init__(self, store=None):
+        self.store = store
+        self._known = {}
+        self._lock = threading.Lock()
+
+    def known_status(self, owner, key):
+        """Последний известный статус работы или None."""
+        with self._lock:
+            statuses = self._known.setdefault(owner, {})
+            if key not in statuses:
+                statuses[key] = (
+                    self.store.get_status(owner, key)
+                    if self.store is not None else None
+                )
+            return statuses[key]
+
+    def changes(self, owner, homeworks):
+        """Работы ответа, статус которых изменился.
+
+        Из нескольких записей одной работы учитывается первая: в ответе
+        api-сервиса работы идут от новых к старым.
+        """
+        seen = set()
+        changed = []
+        for homework in homeworks:
+            key = homework_key(homework)
+            if key in seen:
+                continue
+            seen.add(key)
+            if self.known_status(owner, key) != homework.get('status'):
+                changed.append(homework)
+        return changed
+
+    def commit(self, owner, homeworks):
+        """Запоминает статусы доставленных работ."""
+        statuses = {
+            homework_key(homework): homework.get('status')
+            for homework in homeworks
+        }
+        if not statuses:
+            return
+        with self._lock:
+            self._known.setdefault(owner, {}).update(statuses)
+        if self.store is not None:
+            self.store.save_statuses(owner, statuses)
@@ -0,0 +1,206 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from exceptions import ApiIsDown, ApiRateLimited, CircuitIsOpen
+
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', 3))
+BREAKER_BASE_DELAY = float(os.getenv('BREAKER_BASE_DELAY', 30))
+BREAKER_MAX_DELAY = float(os.getenv('BREAKER_MAX_DELAY', 1800))
+BREAKER_JITTER = float(os.getenv('BREAKER_JITTER', 0.2))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+def parse_retry_after(value, now=None):
+    """Секунды из заголовка Retry-After (число или HTTP-дата) или None."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    if now is None:
+        now = time.time()
+    return max(retry_at - now, 0)
+
+
+class CircuitBreaker:
+    """Предохранитель для запросов к api-сервису.
+
+    closed - запросы идут как обычно. После threshold сбоев подряд
+    (ApiIsDown: сеть и ответы 5xx, в том числе 503) предохранитель
+    размыкается (open) и запросы сразу завершаются CircuitIsOpen. Время
+    размыкания растёт экспоненциально с разбросом jitter, а на ответ
+    с Retry-After равно ему. По истечении пропускается один пробный запрос
+    (half-open): успех замыкает цепь, сбой снова размыкает её на удвоенное
+    время. Без trip_on_rate_limit ответы 429 (ApiRateLimited) не размыкают
+    цепь: так общий для многих токенов предохранитель не останавливает
+    опрос из-за лимита одного токена, а паузы по Retry-After ведёт
+    RateLimits.
+    """
+
+    def __init__(self, threshold=BREAKER_FAILURE_THRESHOLD,
+                 base_delay=BREAKER_BASE_DELAY, max_delay=BREAKER_MAX_DELAY,
+                 jitter=BREAKER_JITTER, clock=time.monotonic,
+                 trip_on_rate_limit=True):
+        self.threshold = threshold
+        self.trip_on_rate_limit = trip_on_rate_limit
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.clock = clock
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0
+        self._state = CLOSED
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """Текущее состояние предохранителя."""
+        with self._lock:
+            if self._state == OPEN and self.clock() >= self.open_until:
+                return HALF_OPEN
+            return self._state
+
+    def backoff(self):
+        """Время размыкания для очередного срабатывания."""
+        delay = min(self.base_delay * 2 ** min(self.trips, 16), self.max_delay)
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def before_call(self):
+        """Пропускает запрос или сразу завершает его CircuitIsOpen."""
+        with self._lock:
+            if self._state == OPEN:
+                if self.clock() < self.open_until:
+                    raise CircuitIsOpen(
+                        'Api-сервис недоступен, запросы приостановлены на '
+                        f'{self.open_until - self.clock():.0f} с.'
+                    )
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitIsOpen(
+                        'Api-сервис недоступен, идёт пробный запрос.'
+                    )
+                self._probe_in_flight = True
+
+    def record_success(self):
+        """Замыкает цепь после успешного запроса."""
+        with self._lock:
+            self._state = CLOSED
+            self._probe_in_flight = False
+            self.failures = 0
+            self.trips = 0
+
+    def record_failure(self, retry_after=None):
+        """Учитывает сбой и при необходимости размыкает цепь."""
+        with self._lock:
+            self._probe_in_flight = False
+            self.failures += 1
+            if (
+                self._state != HALF_OPEN
+                and self.failures < self.threshold
+                and retry_after is None
+            ):
+                return
+            delay = self.backoff() if retry_after is None else retry_after
+            self.trips += 1
+            self._state = OPEN
+            self.open_until = self.clock() + delay
+
+    def record_rate_limit(self, error):
+        """Учитывает ответ 429, если он размыкает цепь."""
+        if self.trip_on_rate_limit:
+            self.record_failure(error.retry_after)
+        else:
+            self.release()
+
+    def release(self):
+        """Снимает пробный запрос, завершившийся не сбоем api-сервиса."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def call(self, func, *args, **kwargs):
+        """Вызывает func под защитой предохранителя."""
+        self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except ApiRateLimited as error:
+            self.record_rate_limit(error)
+            raise
+        except ApiIsDown as error:
+            self.record_failure(error.retry_after)
+            raise
+        except Exception:
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+    async def call_async(self, func, *args, **kwargs):
+        """Асинхронный вариант call."""
+        self.before_call()
+        try:
+            result = await func(*args, **kwargs)
+        except ApiRateLimited as error:
+            self.record_rate_limit(error)
+            raise
+        except ApiIsDown as error:
+            self.record_failure(error.retry_after)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+
+class RateLimits:
+    """Паузы по Retry-After для отдельных токенов.
+
+    Ответ 429 приостанавливает запросы только с тем токеном, для которого
+    он получен: на retry_after секунд или на default_delay, если сервис
+    не прислал Retry-After.
+    """
+
+    def __init__(self, default_delay=BREAKER_BASE_DELAY,
+                 clock=time.monotonic):
+        self.default_delay = default_delay
+        self.clock = clock
+        self._until = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._until)
+
+    def check(self, key):
+        """Завершает запрос CircuitIsOpen, если пауза для key не истекла."""
+        with self._lock:
+            until = self._until.get(key)
+            if until is None:
+                return
+            remaining = until - self.clock()
+            if remaining <= 0:
+                del self._until[key]
+                return
+        raise CircuitIsOpen(
+            f'Превышен лимит запросов, пауза ещё {remaining:.0f} с.'
+        )
+
+    def record(self, key, retry_after=None):
+        """Приостанавливает запросы для key после ответа 429."""
+        if retry_after is None:
+            retry_after = self.default_delay
+        with self._lock:
+            self._until[key] = self.clock() + retry_after
@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+
+from homework import TELEGRAM_TOKEN, check_response, logger, parse_status
+
+COMMANDS_ENABLED = os.getenv('COMMANDS_ENABLED', '0') == '1'
+COMMAND_THREADS = int(os.getenv('COMMAND_THREADS', 4))
+STATUS_CACHE_TTL = float(os.getenv('STATUS_CACHE_TTL', 60))
+NO_HOMEWORKS_REPLY = 'Работ на проверке пока нет.'
+
+
+class StatusCommand:
+    """Ответ на /status для одного токена практикума.
+
+    Отвечает по последним работам из ответов api-сервиса: полученных
+    циклом опроса (remember) или запросом по требованию. Запрос по
+    требованию делается не чаще раза в ttl секунд с тем же from_date, что
+    и плановый опрос (fetch), поэтому совпавшие по времени /status и опрос
+    объединяются в один запрос. Пока работ не известно, запрашиваются все
+    работы (fetch_all). Одновременные команды ждут один общий запрос.
+    """
+
+    def __init__(self, fetch, ttl=STATUS_CACHE_TTL, clock=time.monotonic,
+                 fetch_all=None):
+        self.fetch = fetch
+        self.fetch_all = fetch_all or fetch
+        self.ttl = ttl
+        self.clock = clock
+        self._checked = None
+        self._homeworks = None
+        self._lock = threading.Lock()
+
+    def remember(self, api_response):
+        """Учитывает свежий ответ api-сервиса."""
+        homeworks = check_response(api_response)
+        self._checked = self.clock()
+        if homeworks:
+            self._homeworks = homeworks
+
+    def latest(self):
+        """Последние известные работы, при устаревании - новый запрос."""
+        with self._lock:
+            if self._checked is None or (
+                    self.clock() - self._checked >= self.ttl
+            ):
+                self.remember(
+                    self.fetch() if self._homeworks is not None
+                    else self.fetch_all()
+                )
+            return self._homeworks or []
+
+    def reply(self):
+        """Текст ответа: статус последней обновлённой работы."""
+        homeworks = self.latest()
+        if not homeworks:
+            return NO_HOMEWORKS_REPLY
+        return parse_status(homeworks[0])
+
+
+def answer_status(commands, chat_id):
+    """Ответ на /status для чата или None для чужого чата."""
+    command = commands.get(str(chat_id))
+    if command is None:
+        return None
+    try:
+        return command.reply()
+    except Exception as error:
+        logger.error(error, exc_info=True)
+        return f'Не удалось получить статус: {error}.'
+
+
+def start_commands(commands, token=TELEGRAM_TOKEN, threads=COMMAND_THREADS,
+                   enabled=COMMANDS_ENABLED):
+    """Запускает приём команд long polling'ом в фоновом потоке.
+
+    commands - {chat_id: StatusCommand}; команды из других чатов
+    игнорируются. Обработчики выполняются в пуле из threads потоков
+    TeleBot. Без COMMANDS_ENABLED ничего не запускается и возвращается
+    None.
+    """
+    if not enabled or not commands:
+        return None
+    from telebot import TeleBot
+    bot = TeleBot(token, num_threads=threads)
+
+    @bot.message_handler(
+        commands=['status'],
+        func=lambda message: str(message.chat.id) in commands
+    )
+    def status(message):
+        bot.reply_to(message, answer_status(commands, message.chat.id))
+
+    threading.Thread(
+        target=bot.infinity_polling, kwargs={'skip_pending': True},
+        name='telegram-commands', daemon=True
+    ).start()
+    logger.debug('Запущен приём команд для чатов: %s', len(commands))
+    return bot
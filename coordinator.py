@@ -0,0 +1,200 @@
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from contextlib import closing
+
+import metrics
+from exceptions import NoTokenEnv
+from fleet import (SUBSCRIBERS_FILE, FleetPoller, SubscriptionRegistry,
+                   restore_subscriptions)
+from homework import TELEGRAM_TOKEN, logger, use_telegram_api
+from sharding import shard_for
+from shutdown import SHUTDOWN_TIMEOUT, GracefulShutdown
+from state import StateStore
+from telegram_queue import TELEGRAM_GLOBAL_RATE, SendQueue
+
+SHARD_WORKERS = int(os.getenv('SHARD_WORKERS', os.cpu_count() or 1))
+COORDINATOR_CHECK_PERIOD = float(os.getenv('COORDINATOR_CHECK_PERIOD', 5))
+
+Worker = namedtuple('Worker', ('process', 'connection'))
+
+
+def rebalance(registry, subscribers, shard, members, store):
+    """Оставляет в registry подписки шарда shard; число переехавших."""
+    added = []
+    removed = 0
+    for subscription in subscribers:
+        owned = shard_for(subscription.token, members) == shard
+        if owned and subscription.token not in registry:
+            added.append(registry.add(
+                subscription.token, subscription.chat_id,
+                subscription.timestamp
+            ))
+        elif not owned and subscription.token in registry:
+            registry.remove(subscription.token)
+            removed += 1
+    restore_subscriptions(added, store)
+    return len(added) + removed
+
+
+def serve_shard(poller, subscribers, shard, members, connection):
+    """Опрос доли подписок, пока координатор не закроет соединение."""
+    while True:
+        moved = rebalance(
+            poller.registry, subscribers, shard, members, poller.store
+        )
+        logger.info('Шард %s из %s: подписок %s, переехало %s',
+                    shard, len(members), len(poller.registry), moved)
+        poller.schedule_all()
+        while True:
+            delay = poller.run_pending()
+            metrics.SLEEP_SECONDS.observe(delay)
+            with poller.shutdown.sleeping():
+                if connection.poll(delay):
+                    break
+        try:
+            members = connection.recv()
+        except EOFError:
+            return
+
+
+def run_worker(shard, connection, path=SUBSCRIBERS_FILE):
+    """Процесс-шард: ждёт состав шардов и опрашивает свою долю."""
+    try:
+        members = connection.recv()
+    except EOFError:
+        return
+    if metrics.METRICS_PORT:
+        metrics.start_http_server(int(metrics.METRICS_PORT) + 1 + shard)
+    subscribers = SubscriptionRegistry.from_file(path)
+    store = StateStore()
+    from telebot import TeleBot
+    use_telegram_api()
+    bot = TeleBot(token=TELEGRAM_TOKEN)
+    outbox = SendQueue(
+        bot, global_rate=TELEGRAM_GLOBAL_RATE / SHARD_WORKERS
+    ).start()
+    with GracefulShutdown() as shutdown, closing(store):
+        poller = FleetPoller(
+            bot, SubscriptionRegistry(), store=store, outbox=outbox,
+            shutdown=shutdown
+        )
+        try:
+            serve_shard(poller, subscribers, shard, members, connection)
+        finally:
+            poller.close()
+            outbox.stop(SHUTDOWN_TIMEOUT)
+
+
+class Coordinator:
+    """Процессы-шарды, опрашивающие подписки из SUBSCRIBERS_FILE.
+
+    Координатор рассылает процессам состав шардов; каждый опрашивает свою
+    долю подписок (rendezvous-хэширование по токену), а при изменении
+    состава забирает или отдаёт только затронутые подписки. Номер нового
+    шарда - наименьший свободный, поэтому перезапущенный процесс занимает
+    место упавшего и забирает обратно его подписки.
+    """
+
+    def __init__(self, target=run_worker, context=None):
+        self.target = target
+        self.context = context or multiprocessing.get_context('spawn')
+        self._workers = {}
+
+    def __len__(self):
+        return len(self._workers)
+
+    @property
+    def members(self):
+        """Номера работающих шардов."""
+        return sorted(self._workers)
+
+    def add_worker(self):
+        """Запускает процесс для наименьшего свободного номера шарда."""
+        shard = next(
+            index for index in range(len(self._workers) + 1)
+            if index not in self._workers
+        )
+        parent, child = self.context.Pipe()
+        process = self.context.Process(
+            target=self.target, args=(shard, child),
+            name=f'fleet-shard-{shard}', daemon=True
+        )
+        process.start()
+        child.close()
+        self._workers[shard] = Worker(process, parent)
+        return shard
+
+    def remove_worker(self, shard, timeout=SHUTDOWN_TIMEOUT):
+        """Останавливает процесс шарда по SIGTERM."""
+        worker = self._workers.pop(shard)
+        worker.process.terminate()
+        worker.process.join(timeout)
+        if worker.process.is_alive():
+            worker.process.kill()
+        worker.connection.close()
+
+    def reap(self):
+        """Убирает из состава завершившиеся процессы; их номера."""
+        dead = [
+            shard for shard, worker in self._workers.items()
+            if not worker.process.is_alive()
+        ]
+        for shard in dead:
+            self._workers.pop(shard).connection.close()
+        return dead
+
+    def broadcast(self):
+        """Рассылает всем процессам текущий состав шардов."""
+        members = self.members
+        for worker in self._workers.values():
+            try:
+                worker.connection.send(members)
+            except OSError:
+                pass
+
+    def scale(self, count):
+        """Доводит число процессов до count и рассылает состав."""
+        while len(self._workers) < count:
+            self.add_worker()
+        while len(self._workers) > count:
+            self.remove_worker(self.members[-1])
+        self.broadcast()
+
+    def run_forever(self, count, shutdown):
+        """Держит count процессов, перезапуская упавшие."""
+        self.scale(count)
+        while True:
+            with shutdown.sleeping():
+                time.sleep(COORDINATOR_CHECK_PERIOD)
+            dead = self.reap()
+            if dead:
+                logger.warning('Завершились шарды %s, перезапуск', dead)
+                self.broadcast()
+                self.scale(count)
+
+    def stop(self, timeout=SHUTDOWN_TIMEOUT):
+        """Останавливает все процессы."""
+        for worker in self._workers.values():
+            worker.process.terminate()
+        for shard in self.members:
+            self.remove_worker(shard, timeout)
+
+
+def main():
+    """Запуск SHARD_WORKERS процессов опроса."""
+    if not TELEGRAM_TOKEN:
+        logger.critical('для работы бота не хватает токена TELEGRAM_TOKEN')
+        raise NoTokenEnv('Не хватает переменных окружения.')
+    coordinator = Coordinator()
+    with GracefulShutdown() as shutdown:
+        try:
+            coordinator.run_forever(SHARD_WORKERS, shutdown)
+        finally:
+            coordinator.stop()
+    logger.info('Координатор остановлен по сигналу.')
+
+
+if __name__ == '__main__':
+    main()
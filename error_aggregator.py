@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+from collections import Counter
+
+ERROR_WINDOW = float(os.getenv('ERROR_WINDOW', 3600))
+ERROR_SUMMARY_PERIOD = float(os.getenv('ERROR_SUMMARY_PERIOD', 3600))
+ERROR_MESSAGE = 'Сбой в работе программы: {error}.'
+SUMMARY_HEADER = 'Повторные сбои за {minutes} мин.:'
+
+
+class ErrorAggregator:
+    """Уведомления о сбоях без повторов.
+
+    Сбои группируются по классу исключения. О первом сбое класса
+    уведомление ставится в очередь сразу, а сбои того же класса в течение
+    window секунд после него только считаются. Раз в summary_period секунд
+    в очередь ставится сводка с числом подавленных сбоев по классам.
+    last_message - последнее уведомление; сбой с тем же текстом сразу
+    после перезапуска не повторяется.
+    """
+
+    def __init__(self, window=ERROR_WINDOW,
+                 summary_period=ERROR_SUMMARY_PERIOD, last_message=None,
+                 clock=time.monotonic):
+        self.window = window
+        self.summary_period = summary_period
+        self.last_message = last_message
+        self.clock = clock
+        self._notified = {}
+        self._suppressed = Counter()
+        self._queue = []
+        self._summary_at = clock()
+        self._lock = threading.Lock()
+
+    def record(self, error):
+        """Учитывает сбой; True, если о нём будет уведомление."""
+        name = type(error).__name__
+        message = ERROR_MESSAGE.format(error=error)
+        with self._lock:
+            now = self.clock()
+            notified_at = self._notified.get(name)
+            if notified_at is None and message == self.last_message:
+                self._notified[name] = now
+                notified_at = now
+            if notified_at is not None and now - notified_at < self.window:
+                self._suppressed[name] += 1
+                return False
+            self._notified[name] = now
+            self.last_message = message
+            self._queue.append(message)
+            return True
+
+    def summary(self):
+        """Текст сводки подавленных сбоев или None."""
+        if not self._suppressed:
+            return None
+        lines = [SUMMARY_HEADER.format(
+            minutes=round(self.summary_period / 60)
+        )]
+        lines.extend(
+            f'{name}: {count}'
+            for name, count in self._suppressed.most_common()
+        )
+        return '\n'.join(lines)
+
+    def pending(self):
+        """Забирает уведомления, в том числе сводку, если пора."""
+        with self._lock:
+            now = self.clock()
+            if now - self._summary_at >= self.summary_period:
+                self._summary_at = now
+                summary = self.summary()
+                if summary is not None:
+                    self._queue.append(summary)
+                self._suppressed.clear()
+            messages, self._queue = self._queue, []
+        return messages
@@ -20,3 +20,21 @@ class NoHomeworkName(Exception):
 
 class NoHomeworkInResponse(Exception):
     pass
+
+
+class ApiIsDown(ApiIsNotReachable):
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ApiRateLimited(ApiIsDown):
+    pass
+
+
+class CircuitIsOpen(ApiIsNotReachable):
+    pass
+
+
+class ShutdownRequested(SystemExit):
+    pass
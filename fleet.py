@@ -0,0 +1,401 @@
+import heapq
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures import as_completed
+from contextlib import closing, nullcontext
+from functools import partial
+
+from requests import Session
+
+import metrics
+from changes import ChangeDetector
+from circuit_breaker import CircuitBreaker, RateLimits
+from commands import StatusCommand, start_commands
+from error_aggregator import ErrorAggregator
+from exceptions import ApiRateLimited, CantSendMessage, NoTokenEnv
+from homework import (API_TIMEOUT, CYCLE_DEADLINE, RETRY_PERIOD,
+                      TELEGRAM_TOKEN, join_messages, logger, make_headers,
+                      observe_cycle, parse_statuses,
+                      request_homework_statuses, send_message_to_chat,
+                      use_telegram_api)
+from http_client import get_session, log_connection_stats
+from response_cache import ResponseCache
+from scheduler import PollState, make_policy
+from sharding import SHARD_COUNT, SHARD_INDEX, select_shard
+from shutdown import SHUTDOWN_TIMEOUT, GracefulShutdown
+from singleflight import SingleFlight
+from state import StateStore, owner_key
+from telegram_queue import TELEGRAM_GLOBAL_RATE, SendQueue
+
+SUBSCRIBERS_FILE = os.getenv('SUBSCRIBERS_FILE', 'subscribers.json')
+POLL_THREADS = int(os.getenv('POLL_THREADS', 0))
+
+
+class Subscription(PollState):
+    """Подписка: токен практикума, чат и метка последнего опроса."""
+
+    __slots__ = ('token', 'chat_id', 'timestamp', 'errors')
+
+    def __init__(self, token, chat_id, timestamp):
+        super().__init__()
+        self.token = token
+        self.chat_id = chat_id
+        self.timestamp = timestamp
+        self.errors = ErrorAggregator()
+
+    @property
+    def prev_message(self):
+        """Последнее уведомление о сбое."""
+        return self.errors.last_message
+
+    @prev_message.setter
+    def prev_message(self, message):
+        self.errors.last_message = message
+
+
+class SubscriptionRegistry:
+    """Реестр подписок: токен -> чат -> последний current_date."""
+
+    def __init__(self):
+        self._subscriptions = {}
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def __iter__(self):
+        return iter(self._subscriptions.values())
+
+    def __contains__(self, token):
+        return token in self._subscriptions
+
+    def add(self, token, chat_id, timestamp=None):
+        """Добавляет подписку или обновляет чат существующей."""
+        if timestamp is None:
+            timestamp = int(time.time())
+        subscription = self._subscriptions.get(token)
+        if subscription is None:
+            subscription = Subscription(token, chat_id, timestamp)
+            self._subscriptions[token] = subscription
+        else:
+            subscription.chat_id = chat_id
+        return subscription
+
+    def get(self, token):
+        """Подписка по токену или None."""
+        return self._subscriptions.get(token)
+
+    def remove(self, token):
+        """Удаляет подписку, если она есть."""
+        self._subscriptions.pop(token, None)
+
+    @classmethod
+    def from_file(cls, path):
+        """Загружает подписки из json-файла со списком token/chat_id."""
+        registry = cls()
+        with open(path, encoding='utf-8') as file:
+            for entry in json.load(file):
+                registry.add(
+                    entry['token'], entry['chat_id'], entry.get('timestamp')
+                )
+        return registry
+
+
+def restore_subscriptions(registry, store):
+    """Восстанавливает метки и последние ошибки подписок из хранилища."""
+    for subscription in registry:
+        checkpoint = store.load(owner_key(subscription.token))
+        if checkpoint.current_date is not None:
+            subscription.timestamp = checkpoint.current_date
+        subscription.prev_message = checkpoint.last_error
+
+
+def save_subscription(store, subscription):
+    """Сохраняет контрольную точку подписки."""
+    store.save_checkpoint(
+        owner_key(subscription.token), subscription.timestamp,
+        subscription.prev_message
+    )
+
+
+class FleetPoller:
+    """Планировщик опроса api-сервиса для всех подписок реестра.
+
+    С threads > 1 подписки, срок опроса которых наступил, опрашиваются
+    параллельно в пуле из threads потоков. Каждый запрос ограничен
+    timeout (connect, read), а проход по подпискам - deadline секундами:
+    опросы, не начатые к дедлайну, откладываются до следующего прохода.
+    """
+
+    def __init__(self, bot, registry, period=RETRY_PERIOD, session=None,
+                 store=None, policy=None, breaker=None, outbox=None,
+                 cache=None, detector=None, shutdown=None,
+                 threads=POLL_THREADS, timeout=API_TIMEOUT,
+                 deadline=CYCLE_DEADLINE):
+        self.bot = bot
+        self.outbox = outbox
+        self.cache = cache if cache is not None else ResponseCache()
+        self.registry = registry
+        self.period = period
+        self.policy = policy if policy is not None else make_policy(period)
+        self.session = session if session is not None else get_session()
+        self.store = store if store is not None else StateStore()
+        self.detector = (
+            detector if detector is not None else ChangeDetector(self.store)
+        )
+        self.breaker = (
+            breaker if breaker is not None
+            else CircuitBreaker(trip_on_rate_limit=False)
+        )
+        self.rate_limits = RateLimits()
+        self.flights = SingleFlight()
+        self.shutdown = shutdown
+        self.timeout = timeout
+        self.deadline = deadline
+        self.commands = {}
+        self.executor = None
+        if threads > 1:
+            self.executor = ThreadPoolExecutor(
+                threads, thread_name_prefix='fleet-poll'
+            )
+        self._queue = []
+
+    def status_commands(self):
+        """Ответы на /status по чатам подписок."""
+        self.commands = {
+            subscription.token: StatusCommand(
+                partial(self.fetch_since_poll, subscription),
+                fetch_all=partial(self.fetch, subscription.token, 0)
+            )
+            for subscription in self.registry
+        }
+        return {
+            str(subscription.chat_id): self.commands[subscription.token]
+            for subscription in self.registry
+        }
+
+    def fetch_since_poll(self, subscription):
+        """Запрос с from_date планового опроса подписки."""
+        return self.fetch(subscription.token, subscription.timestamp)
+
+    def fetch(self, token, timestamp):
+        """Ответ api-сервиса, общий для одновременных запросов."""
+        return self.flights.do(
+            (token, timestamp), self.request, token, timestamp
+        )
+
+    def request(self, token, timestamp):
+        """Запрос с учётом паузы по 429 для токена и предохранителя."""
+        self.rate_limits.check(token)
+        try:
+            return self.breaker.call(
+                request_homework_statuses, make_headers(token), timestamp,
+                self.session, self.cache, self.timeout
+            )
+        except ApiRateLimited as error:
+            self.rate_limits.record(token, error.retry_after)
+            raise
+
+    def schedule_all(self, now=None):
+        """Равномерно распределяет первые опросы подписок по периоду."""
+        if now is None:
+            now = time.monotonic()
+        self._queue = []
+        step = self.period / max(len(self.registry), 1)
+        for index, subscription in enumerate(self.registry):
+            self._queue.append((now + index * step, subscription.token))
+        heapq.heapify(self._queue)
+
+    def send(self, chat_id, text):
+        """Отправляет сообщение сразу или ставит в очередь отправки."""
+        if self.outbox is not None:
+            return self.outbox.put(chat_id, text)
+        return send_message_to_chat(self.bot, chat_id, text)
+
+    def poll(self, subscription):
+        """Опрашивает api-сервис для одной подписки."""
+        owner = owner_key(subscription.token)
+        try:
+            api_response = self.fetch(
+                subscription.token, subscription.timestamp
+            )
+            homeworks_lst = self.cache.prepare(api_response)
+            subscription.observe(homeworks_lst)
+            if homeworks_lst:
+                command = self.commands.get(subscription.token)
+                if command is not None:
+                    command.remember(api_response)
+                changed = self.detector.changes(owner, homeworks_lst)
+                for text in join_messages(
+                        parse_statuses(changed, subscription.errors.record)):
+                    self.send(subscription.chat_id, text)
+                self.detector.commit(owner, changed)
+                subscription.timestamp = api_response.get(
+                    'current_date', subscription.timestamp
+                )
+            else:
+                logger.debug('Нет новых домашних работ с прошлого запроса.')
+        except CantSendMessage as error:
+            logger.error(error, exc_info=True)
+            metrics.ERRORS.inc(exception=type(error).__name__)
+        except Exception as error:
+            logger.error(error, exc_info=True)
+            metrics.ERRORS.inc(exception=type(error).__name__)
+            subscription.errors.record(error)
+        for message in subscription.errors.pending():
+            try:
+                self.send(subscription.chat_id, message)
+            except CantSendMessage as send_error:
+                logger.error(send_error, exc_info=True)
+        save_subscription(self.store, subscription)
+
+    def run_pending(self, now=None):
+        """Опрашивает подписки с наступившим сроком опроса."""
+        if now is None:
+            now = time.monotonic()
+        started = time.monotonic()
+        due = []
+        while self._queue and self._queue[0][0] <= now:
+            item = heapq.heappop(self._queue)
+            if item[1] in self.registry:
+                due.append(item)
+        polled = self.poll_all(
+            [self.registry.get(token) for _, token in due],
+            started + self.deadline if self.deadline else None
+        )
+        for due_at, token in due:
+            if token in polled:
+                due_at = time.monotonic() + self.policy.next_delay(
+                    self.registry.get(token)
+                )
+            heapq.heappush(self._queue, (due_at, token))
+        if polled:
+            observe_cycle(started, self.deadline)
+        if polled and isinstance(self.session, Session):
+            log_connection_stats(self.session)
+        if not self._queue:
+            return self.period
+        return max(self._queue[0][0] - time.monotonic(), 0)
+
+    def poll_all(self, subscriptions, deadline=None):
+        """Опрашивает подписки по очереди или в пуле; токены опрошенных.
+
+        По очереди после сигнала остановки или дедлайна новые опросы не
+        начинаются. В пуле результаты забираются по мере завершения
+        запросов, а не начатые к дедлайну опросы отменяются. Отложенные
+        подписки остаются в начале очереди.
+        """
+        if self.executor is None:
+            polled = set()
+            for subscription in subscriptions:
+                if self.stopping or (
+                        deadline is not None and time.monotonic() >= deadline
+                ):
+                    break
+                self.poll(subscription)
+                polled.add(subscription.token)
+        else:
+            polled = self.poll_in_pool(subscriptions, deadline)
+        cancelled = len(subscriptions) - len(polled)
+        if cancelled:
+            metrics.POLLS_CANCELLED.inc(cancelled)
+            logger.warning('Дедлайн цикла: отложено опросов %s', cancelled)
+        return polled
+
+    def poll_in_pool(self, subscriptions, deadline=None):
+        """Опрос в пуле потоков; токены начатых опросов.
+
+        После сигнала остановки ещё не начатые опросы отменяются.
+        """
+        started = set()
+
+        def poll(subscription):
+            if self.stopping:
+                return
+            started.add(subscription.token)
+            self.poll(subscription)
+
+        futures = [
+            self.executor.submit(poll, subscription)
+            for subscription in subscriptions
+        ]
+        timeout = None
+        if deadline is not None:
+            timeout = max(deadline - time.monotonic(), 0)
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                error = future.exception()
+                if error is not None:
+                    logger.error(error, exc_info=error)
+                    metrics.ERRORS.inc(exception=type(error).__name__)
+                if self.stopping:
+                    break
+        except FuturesTimeoutError:
+            pass
+        for future in futures:
+            future.cancel()
+        return started
+
+    def close(self):
+        """Дожидается опросов в пуле и останавливает его."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    @property
+    def stopping(self):
+        """Получен ли сигнал остановки."""
+        return self.shutdown is not None and self.shutdown.requested
+
+    def run_forever(self):
+        """Цикл опроса всех подписок до сигнала остановки."""
+        self.schedule_all()
+        while True:
+            delay = self.run_pending()
+            metrics.SLEEP_SECONDS.observe(delay)
+            metrics.export_textfile()
+            sleeping = (
+                self.shutdown.sleeping() if self.shutdown is not None
+                else nullcontext()
+            )
+            with sleeping:
+                time.sleep(delay)
+
+
+def main():
+    """Опрос api-сервиса для всех подписчиков из SUBSCRIBERS_FILE."""
+    if not TELEGRAM_TOKEN:
+        logger.critical('для работы бота не хватает токена TELEGRAM_TOKEN')
+        raise NoTokenEnv('Не хватает переменных окружения.')
+    registry = select_shard(SubscriptionRegistry.from_file(SUBSCRIBERS_FILE))
+    logger.debug('Загружено подписок: %s (шард %s из %s)',
+                 len(registry), SHARD_INDEX, SHARD_COUNT)
+    store = StateStore()
+    restore_subscriptions(registry, store)
+    metrics.start_exporter()
+    from telebot import TeleBot
+    use_telegram_api()
+    bot = TeleBot(token=TELEGRAM_TOKEN)
+    outbox = SendQueue(
+        bot, global_rate=TELEGRAM_GLOBAL_RATE / SHARD_COUNT
+    ).start()
+    with GracefulShutdown() as shutdown, closing(store):
+        poller = FleetPoller(
+            bot, registry, store=store, outbox=outbox, shutdown=shutdown
+        )
+        if SHARD_COUNT == 1:
+            start_commands(poller.status_commands())
+        try:
+            poller.run_forever()
+        finally:
+            poller.close()
+            unsent = outbox.stop(SHUTDOWN_TIMEOUT)
+            if unsent:
+                logger.warning('При остановке не отправлено сообщений: %s',
+                               unsent)
+    logger.info('Опрос остановлен по сигналу.')
+
+
+if __name__ == '__main__':
+    main()
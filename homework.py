@@ -1,42 +1,57 @@
 import logging
 import os
-import sys
 import time
+from contextlib import closing
+from functools import partial
 from http import HTTPStatus
 
 import requests
 from dotenv import load_dotenv
 from requests import RequestException
-from telebot import TeleBot
-from telebot.apihelper import ApiException
 
-from exceptions import (ApiIsNotReachable, CantSendMessage,
-                        NoHomeworkInResponse, NoTokenEnv, WrongHomeworkStatus)
+import metrics
+from changes import ChangeDetector
+from circuit_breaker import CircuitBreaker, parse_retry_after
+from error_aggregator import ErrorAggregator
+from exceptions import (ApiIsDown, ApiIsNotReachable, ApiRateLimited,
+                        CantSendMessage, NoHomeworkInResponse, NoTokenEnv,
+                        WrongHomeworkStatus)
+from json_decoder import decode_response
+from log_config import configure_logger
+from models import homework_key
+from scheduler import PollState, make_policy
+from shutdown import GracefulShutdown
+from singleflight import SingleFlight
+from state import StateStore, owner_key
+from templates import make_registry
 
 load_dotenv()
 
-ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+ENDPOINT = os.getenv(
+    'PRACTICUM_ENDPOINT',
+    'https://practicum.yandex.ru/api/user_api/homework_statuses/'
+)
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+TELEGRAM_API_URL = os.getenv('TELEGRAM_API_URL')
 RETRY_PERIOD = 600
+API_CONNECT_TIMEOUT = float(os.getenv('API_CONNECT_TIMEOUT', 5))
+API_READ_TIMEOUT = float(os.getenv('API_READ_TIMEOUT', 30))
+API_TIMEOUT = (API_CONNECT_TIMEOUT, API_READ_TIMEOUT)
+CYCLE_DEADLINE = float(os.getenv('CYCLE_DEADLINE', 60))
+TELEGRAM_MESSAGE_LIMIT = 4096
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+REQUEST_LOG_SUMMARY = f'GET {ENDPOINT} (Authorization: OAuth ***)'
 HOMEWORK_VERDICTS = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+TEMPLATES = make_registry(HOMEWORK_VERDICTS)
+API_FLIGHTS = SingleFlight()
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-
-handler = logging.StreamHandler(sys.stdout)
-handler.setLevel(logging.DEBUG)
-formatter = logging.Formatter(
-    '%(asctime)s - %(levelname)s - %(module)s - '
-    '%(filename)s:%(lineno)d - %(funcName)s - %(message)s'
-)
-handler.setFormatter(formatter)
-logger.addHandler(handler)
+configure_logger(logger)
 
 
 def check_tokens():
@@ -57,42 +72,131 @@ def check_tokens():
     return missing_tokens
 
 
-def send_message(bot, message):
-    """Отправка сообщения в телеграм."""
+def use_telegram_api(url=TELEGRAM_API_URL):
+    """Направляет запросы telebot на url вместо api.telegram.org."""
+    if not url:
+        return
+    from telebot import apihelper
+    apihelper.API_URL = url.rstrip('/') + '/bot{0}/{1}'
     try:
-        logger.debug(f'Начало отправки сообщения "{message}"')
+        from telebot import asyncio_helper
+    except ImportError:
+        return
+    asyncio_helper.API_URL = apihelper.API_URL
+
+
+def send_message_to_chat(bot, chat_id, message):
+    """Отправка сообщения в указанный чат телеграма."""
+    from telebot.apihelper import ApiException
+    try:
+        logger.debug('Начало отправки сообщения "%s"', message)
         bot.send_message(
-            chat_id=TELEGRAM_CHAT_ID,
+            chat_id=chat_id,
             text=message
         )
-        logger.debug(f'Удачная отправка сообщения "{message}"')
+        logger.debug('Удачная отправка сообщения "%s"', message)
     except (ApiException, RequestException) as e:
+        metrics.MESSAGES_FAILED.inc()
         raise CantSendMessage(f'Не переслано сообщение {message}. Ошибка: {e}')
+    metrics.MESSAGES_SENT.inc()
     return True
 
 
-def get_api_answer(timestamp):
-    """Получить ответ от api-сервиса."""
+def send_message(bot, message):
+    """Отправка сообщения в телеграм."""
+    return send_message_to_chat(bot, TELEGRAM_CHAT_ID, message)
+
+
+def send_error_notices(bot, errors):
+    """Отправка накопленных уведомлений о сбоях в телеграм."""
+    for message in errors.pending():
+        try:
+            send_message(bot, message)
+        except CantSendMessage as error:
+            logger.error(error, exc_info=True)
+
+
+def make_headers(token):
+    """Заголовки запроса к api-сервису для токена практикума."""
+    return {'Authorization': f'OAuth {token}'}
+
+
+def api_status_error(status_code, response):
+    """Исключение для ответа api-сервиса с кодом, отличным от 200."""
+    if status_code == HTTPStatus.TOO_MANY_REQUESTS:
+        return ApiRateLimited(
+            f'Api-сервис ограничил частоту запросов, код {status_code}.',
+            parse_retry_after(response.headers.get('Retry-After'))
+        )
+    if status_code == HTTPStatus.SERVICE_UNAVAILABLE:
+        return ApiIsDown(
+            f'Api-сервис вернул ошибку, код {status_code}.',
+            parse_retry_after(response.headers.get('Retry-After'))
+        )
+    if status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+        return ApiIsDown(f'Api-сервис вернул ошибку, код {status_code}.')
+    return ApiIsNotReachable('Неправильный статус ответа от api-сервиса.')
+
+
+def request_homework_statuses(headers, timestamp, session=requests,
+                              cache=None, timeout=None):
+    """Запрос статусов домашних работ с указанными заголовками.
+
+    session - объект с методом get: модуль requests или общая сессия
+    с пулом соединений из http_client. cache - ResponseCache из
+    response_cache для условных запросов и ответов без разбора json.
+    timeout передаётся в session.get.
+    """
+    key = (headers['Authorization'], timestamp)
+    cached = cache.get(key) if cache is not None else None
+    if cached is not None:
+        headers = {**headers, **cached.validators}
     connection_data = {
-        'url':
-            'https://practicum.yandex.ru/api/user_api/homework_statuses/',
+        'url': ENDPOINT,
         'params': {'from_date': timestamp},
-        'headers': HEADERS,
+        'headers': headers,
     }
+    if timeout is not None:
+        connection_data['timeout'] = timeout
+    started = time.monotonic()
     try:
         logger.debug(
-            'Начало отправки запроса к API-сервису {url}, '
-            'данные заголовка {headers}, с параметрами {params}.'.format(
-                **connection_data
-            ))
-        homework_statuses = requests.get(
+            'Начало отправки запроса к API-сервису %s, с параметрами %s.',
+            REQUEST_LOG_SUMMARY, connection_data['params']
+        )
+        homework_statuses = session.get(
             **connection_data
         )
     except RequestException:
-        raise ApiIsNotReachable('Api-сервис недоступен.')
+        metrics.API_RESPONSES.inc(code='error')
+        raise ApiIsDown('Api-сервис недоступен.')
+    finally:
+        metrics.API_REQUEST_SECONDS.observe(time.monotonic() - started)
+    metrics.API_RESPONSES.inc(code=int(homework_statuses.status_code))
+    if (
+        cached is not None
+        and homework_statuses.status_code == HTTPStatus.NOT_MODIFIED
+    ):
+        return cache.not_modified(cached)
     if homework_statuses.status_code != HTTPStatus.OK:
-        raise ApiIsNotReachable('Неправильный статус ответа от api-сервиса.')
-    return homework_statuses.json()
+        raise api_status_error(
+            homework_statuses.status_code, homework_statuses
+        )
+    if cache is not None:
+        return cache.update(key, homework_statuses)
+    return decode_response(homework_statuses)
+
+
+def get_api_answer(timestamp):
+    """Получить ответ от api-сервиса.
+
+    Одновременные запросы с тем же from_date (цикл опроса и /status)
+    объединяются в один.
+    """
+    return API_FLIGHTS.do(
+        (PRACTICUM_TOKEN, timestamp), request_homework_statuses, HEADERS,
+        timestamp, timeout=API_TIMEOUT
+    )
 
 
 def check_response(api_response):
@@ -118,43 +222,126 @@ def check_response(api_response):
 def parse_status(homework):
     """Составляет сообщение на основе статуса домашней работы."""
     try:
-        homework_name = homework['homework_name']
-        verdict = HOMEWORK_VERDICTS[f'{homework["status"]}']
-        return f'Изменился статус проверки работы "{homework_name}". {verdict}'
+        return TEMPLATES.render(homework['homework_name'], homework['status'])
     except KeyError as e:
         raise WrongHomeworkStatus(f'Неожиданный статус домашней работы {e}.')
 
 
+def parse_statuses(homeworks, on_error=None):
+    """Сообщения по всем работам ответа без повторов по id и статусу.
+
+    Работа с неожиданным статусом не прерывает разбор остальных: ошибка
+    пишется в лог и передаётся в on_error, если он задан.
+    """
+    seen = set()
+    messages = []
+    for homework in homeworks:
+        key = (homework_key(homework), homework.get('status'))
+        if key in seen:
+            continue
+        seen.add(key)
+        try:
+            messages.append(parse_status(homework))
+        except WrongHomeworkStatus as error:
+            logger.error(error, exc_info=True)
+            metrics.ERRORS.inc(exception=type(error).__name__)
+            if on_error is not None:
+                on_error(error)
+    return messages
+
+
+def observe_cycle(started, deadline=CYCLE_DEADLINE):
+    """Учитывает длительность цикла и превышение его дедлайна."""
+    elapsed = time.monotonic() - started
+    metrics.CYCLE_SECONDS.observe(elapsed)
+    if deadline and elapsed > deadline:
+        metrics.CYCLE_OVERRUNS.inc()
+        logger.warning('Цикл опроса занял %.1f с при дедлайне %s с.',
+                       elapsed, deadline)
+    return elapsed
+
+
+def join_messages(messages, limit=TELEGRAM_MESSAGE_LIMIT):
+    """Склеивает сообщения в тексты не длиннее лимита телеграма."""
+    texts = []
+    current = ''
+    for message in messages:
+        while len(message) > limit:
+            if current:
+                texts.append(current)
+                current = ''
+            texts.append(message[:limit])
+            message = message[limit:]
+        if not current:
+            current = message
+        elif len(current) + 1 + len(message) <= limit:
+            current = f'{current}\n{message}'
+        else:
+            texts.append(current)
+            current = message
+    if current:
+        texts.append(current)
+    return texts
+
+
 def main():
     """Основная логика работы бота."""
     if check_tokens():
         raise NoTokenEnv('Не хватает переменных окружения.')
+    from telebot import TeleBot
+
+    from commands import StatusCommand, start_commands
+    use_telegram_api()
     bot = TeleBot(token=TELEGRAM_TOKEN)
-    prev_message = None
-    timestamp = int(time.time())
-    while True:
-        try:
-            api_response = get_api_answer(timestamp)
-            homeworks_lst = check_response(api_response)
-            if homeworks_lst:
-                if send_message(
-                        bot, parse_status(homeworks_lst[0])):
+    store = StateStore()
+    owner = owner_key(PRACTICUM_TOKEN)
+    checkpoint = store.load(owner)
+    detector = ChangeDetector(store)
+    errors = ErrorAggregator(last_message=checkpoint.last_error)
+    timestamp = checkpoint.current_date or int(time.time())
+    policy = make_policy(RETRY_PERIOD)
+    poll_state = PollState()
+    breaker = CircuitBreaker()
+    status = StatusCommand(
+        lambda: breaker.call(get_api_answer, timestamp),
+        fetch_all=partial(breaker.call, get_api_answer, 0)
+    )
+    start_commands({TELEGRAM_CHAT_ID: status})
+    metrics.start_exporter()
+    with GracefulShutdown() as shutdown, closing(store):
+        while True:
+            started = time.monotonic()
+            try:
+                api_response = breaker.call(get_api_answer, timestamp)
+                homeworks_lst = check_response(api_response)
+                poll_state.observe(homeworks_lst)
+                if homeworks_lst:
+                    status.remember(api_response)
+                    changed = detector.changes(owner, homeworks_lst)
+                    for text in join_messages(
+                            parse_statuses(changed, errors.record)):
+                        send_message(bot, text)
+                    detector.commit(owner, changed)
                     timestamp = api_response.get('current_date', timestamp)
-                    prev_message = None
-            else:
-                logger.debug('Нет новых домашних работ с прошлого запроса.')
-        except Exception as error:
-            logger.error(error, exc_info=True)
-            message = f'Сбой в работе программы: {error}.'
-            if (
-                    prev_message != message and not isinstance(error,
-                                                               CantSendMessage
-                                                               )
-                    and send_message(message)
-            ):
-                prev_message = message
-        finally:
-            time.sleep(RETRY_PERIOD)
+                else:
+                    logger.debug(
+                        'Нет новых домашних работ с прошлого запроса.'
+                    )
+            except Exception as error:
+                logger.error(error, exc_info=True)
+                metrics.ERRORS.inc(exception=type(error).__name__)
+                if not isinstance(error, CantSendMessage):
+                    errors.record(error)
+            finally:
+                send_error_notices(bot, errors)
+                store.save_checkpoint(owner, timestamp, errors.last_message)
+                delay = policy.next_delay(poll_state)
+                observe_cycle(started)
+                metrics.SLEEP_SECONDS.observe(delay)
+                metrics.export_textfile()
+                with shutdown.sleeping():
+                    time.sleep(delay)
+    logger.info('Бот остановлен по сигналу.')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,129 @@
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from homework import API_TIMEOUT, CYCLE_DEADLINE, logger
+
+HTTP_POOL_CONNECTIONS = int(os.getenv('HTTP_POOL_CONNECTIONS', 4))
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 16))
+HTTP_POOL_BLOCK = os.getenv('HTTP_POOL_BLOCK', '1') == '1'
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', 2))
+HTTP_RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF', 0.5))
+RETRY_STATUSES = (502, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def worst_case_seconds(connect_retries, status_retries, timeout=API_TIMEOUT,
+                       backoff_factor=HTTP_RETRY_BACKOFF):
+    """Наибольшее время запроса с повторами.
+
+    Таймаут чтения не повторяется. Повтор после сбоя соединения добавляет
+    до connect секунд, повтор после ответа 502/504 - до connect + read,
+    и перед каждым повтором - пауза backoff.
+    """
+    connect_timeout, read_timeout = timeout
+    retries = connect_retries + status_retries
+    return (
+        connect_retries * connect_timeout
+        + (status_retries + 1) * (connect_timeout + read_timeout)
+        + sum(backoff_factor * 2 ** attempt for attempt in range(retries))
+    )
+
+
+def retry_limits(retries=HTTP_RETRIES, timeout=API_TIMEOUT,
+                 deadline=CYCLE_DEADLINE, backoff_factor=HTTP_RETRY_BACKOFF):
+    """Повторы (соединения, по статусу), укладывающиеся в deadline."""
+    status = retries
+    while status and worst_case_seconds(
+            0, status, timeout, backoff_factor) > deadline:
+        status -= 1
+    connect = retries
+    while connect and worst_case_seconds(
+            connect, status, timeout, backoff_factor) > deadline:
+        connect -= 1
+    return connect, status
+
+
+def create_session(pool_connections=HTTP_POOL_CONNECTIONS,
+                   pool_maxsize=HTTP_POOL_MAXSIZE,
+                   pool_block=HTTP_POOL_BLOCK,
+                   retries=HTTP_RETRIES,
+                   backoff_factor=HTTP_RETRY_BACKOFF,
+                   timeout=API_TIMEOUT,
+                   deadline=CYCLE_DEADLINE):
+    """Сессия requests с пулом keep-alive соединений и повторами.
+
+    pool_connections - число пулов (хостов), pool_maxsize - соединений на
+    хост; при pool_block лишние запросы ждут свободного соединения вместо
+    открытия новых сокетов. Таймаут чтения не повторяется, а число
+    повторов урезается так, чтобы запрос с таймаутами timeout укладывался
+    в deadline (worst_case_seconds).
+    """
+    connect, status = retry_limits(retries, timeout, deadline, backoff_factor)
+    retry = Retry(
+        total=connect + status,
+        connect=connect,
+        read=0,
+        status=status,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({'GET'}),
+        raise_on_status=False,
+        respect_retry_after_header=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """Общая для всех подписок и циклов опроса сессия."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def connection_stats(session):
+    """Число открытых соединений и выполненных через них запросов."""
+    connections = 0
+    sent = 0
+    for adapter in set(session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            connections += pool.num_connections
+            sent += pool.num_requests
+    return {
+        'connections': connections,
+        'requests': sent,
+        'reused': max(sent - connections, 0),
+    }
+
+
+def log_connection_stats(session):
+    """Пишет в лог, сколько запросов прошло по уже открытым соединениям."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return None
+    stats = connection_stats(session)
+    logger.debug(
+        'Соединений с api-сервисом открыто: %s, запросов: %s, из них по '
+        'повторно использованным: %s.',
+        stats['connections'], stats['requests'], stats['reused']
+    )
+    return stats
@@ -0,0 +1,60 @@
+import json
+import os
+
+from models import Homework
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_DECODER = os.getenv('JSON_DECODER', 'auto')
+
+
+def select_loads(name=JSON_DECODER):
+    """Функция разбора json: msgspec, orjson или json из stdlib.
+
+    auto выбирает самый быстрый из установленных.
+    """
+    if name in ('auto', 'msgspec') and msgspec is not None:
+        return msgspec.json.Decoder().decode
+    if name in ('auto', 'orjson') and orjson is not None:
+        return orjson.loads
+    return json.loads
+
+
+loads = select_loads()
+
+
+def to_records(api_response):
+    """Заменяет словари работ в ответе записями Homework.
+
+    Ответ неожиданной структуры возвращается как есть: его отклонит
+    check_response с прежними исключениями.
+    """
+    if isinstance(api_response, dict):
+        homeworks = api_response.get('homeworks')
+        if isinstance(homeworks, list):
+            return {**api_response, 'homeworks': [
+                Homework.from_dict(item) if isinstance(item, dict) else item
+                for item in homeworks
+            ]}
+    return api_response
+
+
+def decode_api_response(body):
+    """Разбор тела ответа api-сервиса в словарь с записями Homework."""
+    return to_records(loads(body))
+
+
+def decode_response(response):
+    """Разбор ответа requests; объекты без content разбираются их json()."""
+    content = getattr(response, 'content', None)
+    if content is None:
+        return to_records(response.json())
+    return decode_api_response(content)
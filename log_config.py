@@ -0,0 +1,132 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG').upper()
+LOG_MODE = os.getenv('LOG_MODE', 'sync')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+TEXT_FORMAT = (
+    '%(asctime)s - %(levelname)s - %(module)s - '
+    '%(filename)s:%(lineno)d - %(funcName)s - %(message)s'
+)
+REDACTED = '***'
+SECRET_PATTERNS = (
+    (re.compile(r'(OAuth\s+)[^\s\'",}]+'), rf'\g<1>{REDACTED}'),
+    (re.compile(r'(?<!\d)\d{5,}:[\w-]{30,}'), REDACTED),
+)
+
+
+EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class RedactingFilter(logging.Filter):
+    """Заменяет секреты (OAuth-токен, токен бота) в тексте записи."""
+
+    def __init__(self, patterns=SECRET_PATTERNS):
+        super().__init__()
+        self.patterns = patterns
+
+    def redact(self, text):
+        """Текст с замаскированными секретами."""
+        for pattern, replacement in self.patterns:
+            text = pattern.sub(replacement, text)
+        return text
+
+    def filter(self, record):
+        """Маскирует секреты в сообщении записи."""
+        message = record.getMessage()
+        redacted = self.redact(message)
+        if redacted != message:
+            record.msg = redacted
+            record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.redact(
+                EXCEPTION_FORMATTER.formatException(record.exc_info)
+            )
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler, теряющий запись при переполненной очереди.
+
+    Очередь живёт внутри процесса, поэтому запись кладётся как есть:
+    сообщение, traceback и маскирование секретов вычисляются в потоке
+    QueueListener, а не в вызывающем.
+    """
+
+    def prepare(self, record):
+        """Запись без форматирования в вызывающем потоке."""
+        return record
+
+    def enqueue(self, record):
+        """Кладёт запись в очередь без ожидания."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись лога - одна строка json."""
+
+    def format(self, record):
+        """Запись лога в виде json-строки."""
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'line': record.lineno,
+            'func': record.funcName,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = (
+                record.exc_text or self.formatException(record.exc_info)
+            )
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def stop_listener(listener):
+    """Дописывает очередь и останавливает поток, если он ещё работает."""
+    if listener._thread is not None:
+        listener.stop()
+
+
+def make_formatter(log_format=LOG_FORMAT):
+    """Форматтер по названию: text или json."""
+    if log_format == 'json':
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def configure_logger(logger, mode=LOG_MODE, log_format=LOG_FORMAT,
+                     level=LOG_LEVEL):
+    """Настраивает вывод логгера в stdout.
+
+    mode=sync пишет в stdout из вызывающего потока. mode=queue только
+    кладёт запись в очередь, а маскирует секреты, форматирует и пишет её
+    отдельный поток QueueListener, так что цикл опроса не ждёт вывода.
+    """
+    logger.setLevel(level)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setLevel(level)
+    handler.setFormatter(make_formatter(log_format))
+    handler.addFilter(RedactingFilter())
+    if mode != 'queue':
+        logger.addHandler(handler)
+        return None
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    records = queue.Queue(LOG_QUEUE_SIZE)
+    listener = QueueListener(records, handler, respect_handler_level=True)
+    logger.addHandler(DroppingQueueHandler(records))
+    listener.start()
+    atexit.register(stop_listener, listener)
+    return listener
@@ -0,0 +1,215 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_PORT = os.getenv('METRICS_PORT')
+METRICS_TEXTFILE = os.getenv('METRICS_TEXTFILE')
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SLEEP_BUCKETS = (1, 10, 60, 120, 300, 600, 1200, 3600)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def format_labels(labelnames, values, extra=()):
+    """Метки в формате {name="value",...}."""
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n')
+        )
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+class Counter:
+    """Счётчик с метками."""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """Увеличивает счётчик для набора меток."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Текущее значение для набора меток."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def samples(self):
+        """Строки выборки для текстового формата."""
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f'{self.name}{format_labels(self.labelnames, key)} {value}'
+
+
+class Histogram:
+    """Гистограмма с накопительными корзинами."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, buckets=LATENCY_BUCKETS,
+                 labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """Учитывает одно наблюдение."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * len(self.buckets) + [0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def count(self, **labels):
+        """Число наблюдений для набора меток."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        series = self._values.get(key)
+        return series[-2] if series else 0
+
+    def samples(self):
+        """Строки выборки для текстового формата."""
+        with self._lock:
+            items = [(key, list(series)) for key, series in
+                     self._values.items()]
+        for key, series in items:
+            for bound, count in zip(self.buckets, series):
+                labels = format_labels(
+                    self.labelnames, key, (('le', repr(float(bound))),)
+                )
+                yield f'{self.name}_bucket{labels} {count}'
+            labels = format_labels(self.labelnames, key, (('le', '+Inf'),))
+            yield f'{self.name}_bucket{labels} {series[-2]}'
+            labels = format_labels(self.labelnames, key)
+            yield f'{self.name}_count{labels} {series[-2]}'
+            yield f'{self.name}_sum{labels} {series[-1]}'
+
+
+class Registry:
+    """Набор метрик процесса."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        """Добавляет метрику в реестр."""
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Все метрики в текстовом формате Prometheus."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+API_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'homework_api_request_seconds', 'Длительность запроса к api-сервису.'
+))
+API_RESPONSES = REGISTRY.register(Counter(
+    'homework_api_responses_total', 'Ответы api-сервиса по коду.',
+    ('code',)
+))
+ERRORS = REGISTRY.register(Counter(
+    'homework_errors_total', 'Исключения цикла опроса по типу.',
+    ('exception',)
+))
+MESSAGES_SENT = REGISTRY.register(Counter(
+    'homework_messages_sent_total', 'Отправленные сообщения телеграма.'
+))
+MESSAGES_FAILED = REGISTRY.register(Counter(
+    'homework_messages_failed_total', 'Неотправленные сообщения телеграма.'
+))
+CYCLE_SECONDS = REGISTRY.register(Histogram(
+    'homework_cycle_seconds', 'Длительность цикла опроса.'
+))
+CYCLE_OVERRUNS = REGISTRY.register(Counter(
+    'homework_cycle_deadline_exceeded_total',
+    'Циклы опроса, не уложившиеся в CYCLE_DEADLINE.'
+))
+POLLS_CANCELLED = REGISTRY.register(Counter(
+    'homework_polls_cancelled_total',
+    'Опросы подписок, отложенные из-за дедлайна цикла.'
+))
+SLEEP_SECONDS = REGISTRY.register(Histogram(
+    'homework_sleep_seconds', 'Пауза между циклами опроса.',
+    buckets=SLEEP_BUCKETS
+))
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Отдаёт метрики реестра по GET /metrics."""
+
+    registry = REGISTRY
+
+    def do_GET(self):
+        """Ответ на запрос метрик."""
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Запросы метрик не пишутся в лог."""
+
+
+def start_http_server(port, host='0.0.0.0'):
+    """Запускает http-сервер метрик в фоновом потоке."""
+    server = ThreadingHTTPServer((host, int(port)), MetricsHandler)
+    thread = threading.Thread(
+        target=server.serve_forever, name='metrics-http', daemon=True
+    )
+    thread.start()
+    return server
+
+
+def write_textfile(path, registry=REGISTRY):
+    """Атомарно записывает метрики в файл для textfile-коллектора."""
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        file.write(registry.render())
+    os.replace(temporary, path)
+
+
+def start_exporter():
+    """Запускает http-сервер метрик, если задан METRICS_PORT."""
+    if METRICS_PORT:
+        return start_http_server(METRICS_PORT)
+    return None
+
+
+def export_textfile():
+    """Обновляет файл метрик, если задан METRICS_TEXTFILE."""
+    if METRICS_TEXTFILE:
+        write_textfile(METRICS_TEXTFILE)
@@ -0,0 +1,102 @@
+from enum import Enum
+
+
+class HomeworkStatus(str, Enum):
+    """Статус проверки работы.
+
+    Члены перечисления - строки, поэтому сравниваются со статусами из json
+    и подходят как ключи HOMEWORK_VERDICTS.
+    """
+
+    APPROVED = 'approved'
+    REVIEWING = 'reviewing'
+    REJECTED = 'rejected'
+
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+
+STATUSES = {status.value: status for status in HomeworkStatus}
+
+
+def homework_key(homework):
+    """Ключ работы для отслеживания статуса: id, а без него название."""
+    return homework.get('id', homework.get('homework_name'))
+
+
+def intern_status(status):
+    """Член HomeworkStatus для известного статуса, иначе сам статус."""
+    try:
+        return STATUSES.get(status, status)
+    except TypeError:
+        return status
+
+
+class Homework:
+    """Неизменяемая запись о домашней работе из ответа api-сервиса.
+
+    Хранит только поля, нужные для сообщения и отслеживания статуса;
+    к ним можно обращаться и как к ключам словаря (homework['status'],
+    homework.get('id')), поэтому запись подходит везде, где раньше был
+    dict из json.
+    """
+
+    __slots__ = ('id', 'homework_name', 'status', 'date_updated')
+
+    def __init__(self, **fields):
+        for field, value in fields.items():
+            if field == 'status':
+                value = intern_status(value)
+            object.__setattr__(self, field, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Запись из словаря json; остальные поля отбрасываются."""
+        return cls(**{
+            field: data[field] for field in cls.__slots__ if field in data
+        })
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} нельзя изменить')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} нельзя изменить')
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self.__slots__ and hasattr(self, key)
+
+    def __eq__(self, other):
+        if not isinstance(other, Homework):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __hash__(self):
+        return hash(tuple(self.as_dict().items()))
+
+    def __repr__(self):
+        return f'Homework({self.as_dict()!r})'
+
+    def __reduce__(self):
+        return type(self).from_dict, (self.as_dict(),)
+
+    def get(self, key, default=None):
+        """Значение поля или default."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def as_dict(self):
+        """Заполненные поля записи в виде словаря."""
+        return {
+            field: getattr(self, field)
+            for field in self.__slots__ if hasattr(self, field)
+        }
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import metrics
+from homework import check_response
+from json_decoder import decode_response
+
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 10000))
+
+CACHE_HITS = metrics.REGISTRY.register(metrics.Counter(
+    'homework_api_cache_hits_total',
+    'Ответы api-сервиса, не потребовавшие разбора json.', ('reason',)
+))
+
+
+class CachedResponse:
+    """Последний ответ api-сервиса для пары (токен, from_date)."""
+
+    __slots__ = ('etag', 'last_modified', 'digest', 'api_response',
+                 'homeworks')
+
+    def __init__(self, etag, last_modified, digest, api_response):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.api_response = api_response
+        self.homeworks = None
+
+    @property
+    def validators(self):
+        """Заголовки условного запроса."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """LRU-кэш ответов api-сервиса по ключу (токен, from_date).
+
+    Хранит ETag, Last-Modified и хэш тела ответа. На 304 или тело с тем же
+    хэшем возвращается уже разобранный ответ, а проверка и разбор работ
+    (prepare) для него не повторяются.
+    """
+
+    def __init__(self, maxsize=RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._by_response = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Запись кэша по ключу или None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def not_modified(self, entry):
+        """Ответ из кэша для 304 Not Modified."""
+        CACHE_HITS.inc(reason='not_modified')
+        return entry.api_response
+
+    def update(self, key, response):
+        """Ответ для 200 OK: из кэша, если тело не изменилось."""
+        body = response.content
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        entry = self.get(key)
+        if entry is not None and entry.digest == digest:
+            CACHE_HITS.inc(reason='same_body')
+            return entry.api_response
+        entry = CachedResponse(
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+            digest,
+            decode_response(response),
+        )
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._by_response.pop(id(previous.api_response), None)
+            self._entries[key] = entry
+            self._by_response[id(entry.api_response)] = entry
+            while len(self._entries) > self.maxsize:
+                _, evicted = self._entries.popitem(last=False)
+                self._by_response.pop(id(evicted.api_response), None)
+        return entry.api_response
+
+    def prepare(self, api_response):
+        """Проверенный список работ ответа."""
+        entry = self._by_response.get(id(api_response))
+        if entry is None or entry.api_response is not api_response:
+            return check_response(api_response)
+        if entry.homeworks is None:
+            entry.homeworks = check_response(api_response)
+        return entry.homeworks
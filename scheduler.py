@@ -0,0 +1,82 @@
+import os
+import random
+
+ADAPTIVE_POLLING = os.getenv('ADAPTIVE_POLLING', '') == '1'
+FAST_POLL_PERIOD = int(os.getenv('FAST_POLL_PERIOD', 120))
+MAX_POLL_PERIOD = int(os.getenv('MAX_POLL_PERIOD', 3600))
+IDLE_CYCLES_BEFORE_SLOWDOWN = int(os.getenv('IDLE_CYCLES_BEFORE_SLOWDOWN', 6))
+POLL_JITTER = float(os.getenv('POLL_JITTER', 0.1))
+REVIEWING_STATUS = 'reviewing'
+
+
+class PollState:
+    """Что планировщику нужно знать о подписке между опросами."""
+
+    __slots__ = ('idle_cycles', 'reviewing')
+
+    def __init__(self):
+        self.idle_cycles = 0
+        self.reviewing = False
+
+    def observe(self, homeworks):
+        """Учитывает результат очередного успешного опроса."""
+        if not homeworks:
+            self.idle_cycles += 1
+            return
+        self.idle_cycles = 0
+        self.reviewing = any(
+            homework.get('status') == REVIEWING_STATUS
+            for homework in homeworks
+        )
+
+
+class FixedPolicy:
+    """Постоянный интервал опроса."""
+
+    def __init__(self, period):
+        self.period = period
+
+    def next_delay(self, state):
+        """Пауза до следующего опроса."""
+        return self.period
+
+
+class AdaptivePolicy:
+    """Интервал опроса в зависимости от статуса работ и простоя.
+
+    Пока работа на ревью, опрос идёт раз в fast секунд. После
+    slowdown_after пустых ответов подряд интервал удваивается каждый цикл
+    до maximum. К каждому интервалу добавляется случайный разброс jitter,
+    чтобы опросы подписок не собирались в одну секунду.
+    """
+
+    def __init__(self, period, fast=FAST_POLL_PERIOD,
+                 maximum=MAX_POLL_PERIOD,
+                 slowdown_after=IDLE_CYCLES_BEFORE_SLOWDOWN,
+                 jitter=POLL_JITTER):
+        self.period = period
+        self.fast = fast
+        self.maximum = maximum
+        self.slowdown_after = slowdown_after
+        self.jitter = jitter
+
+    def base_delay(self, state):
+        """Интервал опроса без случайного разброса."""
+        if state.reviewing:
+            return self.fast
+        extra_cycles = state.idle_cycles - self.slowdown_after
+        if extra_cycles <= 0:
+            return self.period
+        return min(self.period * 2 ** min(extra_cycles, 16), self.maximum)
+
+    def next_delay(self, state):
+        """Пауза до следующего опроса."""
+        delay = self.base_delay(state)
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+def make_policy(period):
+    """Адаптивная политика при ADAPTIVE_POLLING=1, иначе постоянная."""
+    if ADAPTIVE_POLLING:
+        return AdaptivePolicy(period)
+    return FixedPolicy(period)
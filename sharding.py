@@ -0,0 +1,42 @@
+import hashlib
+import os
+
+SHARD_INDEX = int(os.getenv('SHARD_INDEX', 0))
+SHARD_COUNT = int(os.getenv('SHARD_COUNT', 1))
+
+
+def shard_score(shard, token):
+    """Вес пары (шард, токен) для rendezvous-хэширования."""
+    digest = hashlib.blake2b(
+        f'{shard}:{token}'.encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def shard_for(token, members):
+    """Шард из members, которому принадлежит подписка с токеном token.
+
+    Rendezvous-хэширование: подписку берёт шард с наибольшим весом. При
+    появлении или уходе шарда переезжают только подписки, которые он
+    получает или отдаёт, остальные остаются на месте.
+    """
+    return max(members, key=lambda shard: shard_score(shard, token))
+
+
+def owned_by(shard, members, subscriptions):
+    """Подписки из subscriptions, принадлежащие шарду shard."""
+    return [
+        subscription for subscription in subscriptions
+        if shard_for(subscription.token, members) == shard
+    ]
+
+
+def select_shard(registry, shard=SHARD_INDEX, count=SHARD_COUNT):
+    """Оставляет в реестре только подписки шарда shard из count."""
+    if count <= 1:
+        return registry
+    members = range(count)
+    for subscription in list(registry):
+        if shard_for(subscription.token, members) != shard:
+            registry.remove(subscription.token)
+    return registry
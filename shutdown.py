@@ -0,0 +1,58 @@
+import os
+import signal
+import threading
+from contextlib import contextmanager
+
+from exceptions import ShutdownRequested
+
+SHUTDOWN_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+SHUTDOWN_TIMEOUT = float(os.getenv('SHUTDOWN_TIMEOUT', 10))
+
+
+class GracefulShutdown:
+    """Остановка по SIGTERM/SIGINT без обрыва отправки сообщений.
+
+    Сигнал во время паузы между циклами сразу прерывает time.sleep
+    исключением ShutdownRequested. Сигнал посреди цикла только отмечается:
+    цикл доходит до конца, а исключение возникает перед следующей паузой.
+    Повторный сигнал прерывает работу немедленно. Обработчики ставятся
+    только из главного потока и снимаются при выходе из with, а
+    ShutdownRequested на выходе из with подавляется.
+    """
+
+    def __init__(self, signals=SHUTDOWN_SIGNALS):
+        self.signals = signals
+        self.requested = False
+        self._sleeping = False
+        self._previous = {}
+
+    def __enter__(self):
+        if threading.current_thread() is threading.main_thread():
+            for signum in self.signals:
+                self._previous[signum] = signal.signal(signum, self.handle)
+        return self
+
+    def __exit__(self, *exc_info):
+        for signum, handler in self._previous.items():
+            signal.signal(signum, handler)
+        self._previous.clear()
+        return exc_info[0] is not None and issubclass(
+            exc_info[0], ShutdownRequested
+        )
+
+    def handle(self, signum, frame=None):
+        """Обработчик сигнала остановки."""
+        if self._sleeping or self.requested:
+            raise ShutdownRequested()
+        self.requested = True
+
+    @contextmanager
+    def sleeping(self):
+        """Пауза между циклами, которую прерывает сигнал остановки."""
+        self._sleeping = True
+        try:
+            if self.requested:
+                raise ShutdownRequested()
+            yield
+        finally:
+            self._sleeping = False
@@ -0,0 +1,60 @@
+import threading
+
+import metrics
+
+REQUESTS_COALESCED = metrics.REGISTRY.register(metrics.Counter(
+    'homework_api_requests_coalesced_total',
+    'Запросы, дождавшиеся результата такого же выполняемого запроса.'
+))
+
+
+class Flight:
+    """Выполняемый вызов и его результат."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Объединение одновременных вызовов с одинаковым ключом.
+
+    Первый вызов do с ключом выполняет функцию, а вызовы с тем же ключом,
+    пришедшие до её завершения, ждут и получают тот же результат или то же
+    исключение. Результат не запоминается: вызов после завершения снова
+    выполняет функцию.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._flights)
+
+    def do(self, key, function, *args, **kwargs):
+        """Результат function(*args, **kwargs), общий для ключа key."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight()
+        if not leader:
+            REQUESTS_COALESCED.inc()
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = function(*args, **kwargs)
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+
+STATE_DB_PATH = os.getenv('STATE_DB_PATH', 'state.sqlite3')
+
+Checkpoint = namedtuple('Checkpoint', ('current_date', 'last_error'))
+EMPTY_CHECKPOINT = Checkpoint(None, None)
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS checkpoints ('
+    ' owner TEXT PRIMARY KEY,'
+    ' from_date INTEGER,'
+    ' last_error TEXT'
+    ') WITHOUT ROWID',
+    'CREATE TABLE IF NOT EXISTS statuses ('
+    ' owner TEXT NOT NULL,'
+    ' homework_id TEXT NOT NULL,'
+    ' status TEXT NOT NULL,'
+    ' PRIMARY KEY (owner, homework_id)'
+    ') WITHOUT ROWID',
+)
+
+
+def owner_key(token):
+    """Ключ владельца состояния: хэш токена, сам токен не хранится."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+class StateStore:
+    """Контрольная точка бота в SQLite.
+
+    Хранит current_date последнего ответа, последнюю отправленную ошибку
+    и последний статус каждой работы.
+    """
+
+    def __init__(self, path=STATE_DB_PATH):
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=FULL')
+        self._lock = threading.Lock()
+        self._checkpoints = {}
+        with self._connection:
+            for statement in SCHEMA:
+                self._connection.execute(statement)
+
+    def load(self, owner):
+        """Контрольная точка владельца (поиск по первичному ключу)."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT from_date, last_error FROM checkpoints '
+                'WHERE owner = ?', (owner,)
+            ).fetchone()
+        checkpoint = Checkpoint(*row) if row else EMPTY_CHECKPOINT
+        self._checkpoints[owner] = checkpoint
+        return checkpoint
+
+    def save_checkpoint(self, owner, current_date, last_error):
+        """Сохраняет контрольную точку, если она изменилась."""
+        checkpoint = Checkpoint(current_date, last_error)
+        if self._checkpoints.get(owner) == checkpoint:
+            return False
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT INTO checkpoints (owner, from_date, last_error) '
+                'VALUES (?, ?, ?) ON CONFLICT (owner) DO UPDATE SET '
+                'from_date = excluded.from_date, '
+                'last_error = excluded.last_error',
+                (owner, current_date, last_error)
+            )
+        self._checkpoints[owner] = checkpoint
+        return True
+
+    def get_status(self, owner, homework_id):
+        """Последний сохранённый статус работы или None."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT status FROM statuses '
+                'WHERE owner = ? AND homework_id = ?',
+                (owner, str(homework_id))
+            ).fetchone()
+        return row[0] if row else None
+
+    def save_statuses(self, owner, statuses):
+        """Сохраняет статусы {id работы: статус}; пишутся только изменения."""
+        rows = [
+            (owner, str(homework_id), status)
+            for homework_id, status in statuses.items()
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT INTO statuses (owner, homework_id, status) '
+                'VALUES (?, ?, ?) ON CONFLICT (owner, homework_id) '
+                'DO UPDATE SET status = excluded.status '
+                'WHERE status != excluded.status',
+                rows
+            )
+
+    def close(self):
+        """Закрывает соединение с базой."""
+        with self._lock:
+            self._connection.close()
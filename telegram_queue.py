@@ -0,0 +1,212 @@
+import heapq
+import itertools
+import os
+import queue
+import threading
+import time
+
+from requests import RequestException
+
+import metrics
+from exceptions import CantSendMessage
+from homework import logger
+
+SEND_QUEUE_SIZE = int(os.getenv('SEND_QUEUE_SIZE', 10000))
+TELEGRAM_GLOBAL_RATE = float(os.getenv('TELEGRAM_GLOBAL_RATE', 30))
+TELEGRAM_CHAT_RATE = float(os.getenv('TELEGRAM_CHAT_RATE', 1))
+TELEGRAM_CHAT_BURST = float(os.getenv('TELEGRAM_CHAT_BURST', 3))
+SEND_MAX_ATTEMPTS = int(os.getenv('SEND_MAX_ATTEMPTS', 5))
+TRACKED_CHATS_LIMIT = int(os.getenv('TRACKED_CHATS_LIMIT', 10000))
+TOO_MANY_REQUESTS = 429
+DEFAULT_RETRY_AFTER = 1
+
+
+class TokenBucket:
+    """Ведро токенов: rate токенов в секунду, не больше capacity."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def refill(self, now):
+        """Добавляет токены за прошедшее время."""
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def wait_time(self, now):
+        """Сколько секунд ждать до появления токена."""
+        self.refill(now)
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        """Забирает один токен."""
+        self.tokens -= 1
+
+
+def retry_after(error):
+    """Пауза из ответа телеграма 429 или None для остальных ошибок."""
+    from telebot.apihelper import ApiTelegramException
+    if not isinstance(error, ApiTelegramException):
+        return None
+    if error.error_code != TOO_MANY_REQUESTS:
+        return None
+    parameters = error.result_json.get('parameters') or {}
+    return parameters.get('retry_after', DEFAULT_RETRY_AFTER)
+
+
+class SendQueue:
+    """Очередь исходящих сообщений телеграма с ограничением частоты.
+
+    Опрос кладёт сообщения через put и не ждёт телеграм. Фоновый поток
+    отправляет их не чаще global_rate в секунду в целом и chat_rate
+    в секунду в каждый чат (с запасом chat_burst), а на ответ 429
+    откладывает сообщение на retry_after секунд.
+
+    Следующее сообщение забирается из очереди, только когда глобальный
+    лимит позволяет отправку. Сообщению сверх лимита чата сразу отводится
+    очередное время отправки в этом чате, поэтому порядок сообщений в чате
+    сохраняется. Отложенные сообщения учитываются в maxsize вместе
+    с ожидающими.
+    """
+
+    def __init__(self, bot, maxsize=SEND_QUEUE_SIZE,
+                 global_rate=TELEGRAM_GLOBAL_RATE,
+                 chat_rate=TELEGRAM_CHAT_RATE, chat_burst=TELEGRAM_CHAT_BURST,
+                 max_attempts=SEND_MAX_ATTEMPTS, clock=time.monotonic):
+        self.bot = bot
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self.maxsize = maxsize
+        self._incoming = queue.Queue(maxsize)
+        self._delayed = []
+        self._sequence = itertools.count()
+        self._global = TokenBucket(global_rate, global_rate, clock())
+        self._chats = {}
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return self._incoming.qsize() + len(self._delayed)
+
+    def put(self, chat_id, text):
+        """Ставит сообщение в очередь, не блокируя вызывающий поток."""
+        try:
+            if len(self) >= self.maxsize:
+                raise queue.Full
+            self._incoming.put_nowait((chat_id, text, 0))
+        except queue.Full:
+            raise CantSendMessage(
+                f'Очередь отправки переполнена, не поставлено: {text}'
+            )
+        return True
+
+    def start(self):
+        """Запускает поток отправки."""
+        self._thread = threading.Thread(
+            target=self._run, name='telegram-send-queue', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        """Останавливает поток, дав ему до timeout секунд на отправку."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return len(self)
+
+    def _run(self):
+        while not (self._stopping.is_set() and not len(self)):
+            wait = self._global.wait_time(self.clock())
+            if wait:
+                time.sleep(wait)
+                continue
+            item = self._next_item()
+            if item is not None:
+                self.deliver(*item)
+
+    def _next_item(self):
+        now = self.clock()
+        if self._delayed and self._delayed[0][0] <= now:
+            _, _, item = heapq.heappop(self._delayed)
+            return item
+        timeout = 0.5
+        if self._delayed:
+            timeout = min(self._delayed[0][0] - now, timeout)
+        try:
+            return self._incoming.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _delay(self, item, seconds):
+        heapq.heappush(
+            self._delayed,
+            (self.clock() + seconds, next(self._sequence), item)
+        )
+
+    def _chat_bucket(self, chat_id, now):
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) >= TRACKED_CHATS_LIMIT:
+                self._prune(now)
+            bucket = TokenBucket(self.chat_rate, self.chat_burst, now)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    def _prune(self, now):
+        for chat_id, bucket in list(self._chats.items()):
+            bucket.refill(now)
+            if bucket.tokens >= bucket.capacity:
+                del self._chats[chat_id]
+
+    def deliver(self, chat_id, text, attempts, reserved=False):
+        """Отправляет сообщение, если позволяют лимиты, иначе откладывает.
+
+        reserved - время отправки в чате уже отведено при откладывании.
+        """
+        from telebot.apihelper import ApiException
+        now = self.clock()
+        if not reserved:
+            bucket = self._chat_bucket(chat_id, now)
+            wait = bucket.wait_time(now)
+            bucket.take()
+            if wait:
+                self._delay((chat_id, text, attempts, True), wait)
+                return False
+        wait = self._global.wait_time(now)
+        if wait:
+            self._delay((chat_id, text, attempts, True), wait)
+            return False
+        self._global.take()
+        try:
+            self.bot.send_message(chat_id=chat_id, text=text)
+        except (ApiException, RequestException) as error:
+            pause = retry_after(error)
+            if pause is not None and attempts + 1 < self.max_attempts:
+                logger.debug(
+                    'Телеграм просит подождать %s с перед отправкой в чат %s.',
+                    pause, chat_id
+                )
+                self._delay((chat_id, text, attempts + 1, False), pause)
+                return False
+            metrics.MESSAGES_FAILED.inc()
+            logger.error(
+                CantSendMessage(
+                    f'Не переслано сообщение {text}. Ошибка: {error}'
+                ),
+                exc_info=True
+            )
+            return False
+        metrics.MESSAGES_SENT.inc()
+        logger.debug('Удачная отправка сообщения "%s"', text)
+        return True
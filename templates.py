@@ -0,0 +1,76 @@
+import functools
+import json
+import os
+
+DEFAULT_LOCALE = 'ru'
+MESSAGE_LOCALE = os.getenv('MESSAGE_LOCALE', DEFAULT_LOCALE)
+VERDICTS_FILE = os.getenv('VERDICTS_FILE')
+TEMPLATE_CACHE_SIZE = int(os.getenv('TEMPLATE_CACHE_SIZE', 4096))
+
+MESSAGE_FORMATS = {
+    'ru': 'Изменился статус проверки работы "{homework_name}". {verdict}',
+    'en': 'Review status of "{homework_name}" has changed. {verdict}',
+}
+NAME_PLACEHOLDER = '\0'
+
+
+class TemplateRegistry:
+    """Шаблоны сообщений о статусе работы по ключу (статус, локаль).
+
+    Вердикт подставляется в шаблон один раз при регистрации: шаблон
+    хранится как части текста вокруг названия работы, и сообщение
+    собирается одним str.join. Готовые тексты кэшируются по
+    (название работы, статус, локаль). Статус, для которого в локали нет
+    вердикта, берётся из DEFAULT_LOCALE.
+    """
+
+    def __init__(self, locale=MESSAGE_LOCALE, cache_size=TEMPLATE_CACHE_SIZE):
+        self.locale = locale
+        self._templates = {}
+        self.render = functools.lru_cache(cache_size)(self._render)
+
+    def __contains__(self, key):
+        return key in self._templates
+
+    def add_verdicts(self, verdicts, locale=None, message_format=None):
+        """Регистрирует вердикты {статус: текст} для локали."""
+        locale = locale or self.locale
+        message_format = message_format or MESSAGE_FORMATS.get(
+            locale, MESSAGE_FORMATS[DEFAULT_LOCALE]
+        )
+        for status, verdict in verdicts.items():
+            self._templates[status, locale] = tuple(message_format.format(
+                homework_name=NAME_PLACEHOLDER, verdict=verdict
+            ).split(NAME_PLACEHOLDER))
+        self.render.cache_clear()
+
+    def load_file(self, path):
+        """Добавляет вердикты из json-файла.
+
+        Формат файла: {"локаль": {"статус": "вердикт"}}; необязательный
+        ключ "format" внутри локали задаёт шаблон всего сообщения с
+        полями {homework_name} и {verdict}.
+        """
+        with open(path, encoding='utf-8') as file:
+            locales = json.load(file)
+        for locale, verdicts in locales.items():
+            verdicts = dict(verdicts)
+            message_format = verdicts.pop('format', None)
+            self.add_verdicts(verdicts, locale, message_format)
+
+    def _render(self, homework_name, status, locale=None):
+        parts = self._templates.get((status, locale or self.locale))
+        if parts is None:
+            parts = self._templates.get((status, DEFAULT_LOCALE))
+        if parts is None:
+            raise KeyError(status)
+        return str(homework_name).join(parts)
+
+
+def make_registry(verdicts, path=VERDICTS_FILE):
+    """Реестр с вердиктами из кода и, если задан, из файла VERDICTS_FILE."""
+    registry = TemplateRegistry()
+    registry.add_verdicts(verdicts, DEFAULT_LOCALE)
+    if path:
+        registry.load_file(path)
+    return registry
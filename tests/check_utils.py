@@ -1,3 +1,4 @@
+import json
 import logging
 import signal
 import re
@@ -106,6 +107,23 @@ class MockResponseGET:
             raise ValueError('Server or client error.')
 
 
+class MockResponseWithBody(MockResponseGET):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.content = json.dumps(self.data).encode()
+        self.headers = {'ETag': '"v1"'}
+
+
+def mock_get_with_data(data, http_status=HTTPStatus.OK, calls=None):
+    def mocked_response(*args, **kwargs):
+        if calls is not None:
+            calls.append(kwargs)
+        return MockResponseWithBody(
+            *args, http_status=http_status, data=data, **kwargs
+        )
+    return mocked_response
+
+
 class MockTelegramBot:
     def __init__(self, *args, **kwargs):
         self._is_message_sent = False
@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 import pytest_timeout
 
 root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -53,3 +54,18 @@ pytest_timeout.write = write_timeout_reasons
 os.environ['PRACTICUM_TOKEN'] = 'sometoken'
 os.environ['TELEGRAM_TOKEN'] = '1234:abcdefg'
 os.environ['TELEGRAM_CHAT_ID'] = '12345'
+os.environ['STATE_DB_PATH'] = ':memory:'
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
@@ -0,0 +1,175 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+
+class FakeResponse:
+    def __init__(self, status, data):
+        self.status = status
+        self.data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def json(self):
+        return self.data
+
+    async def read(self):
+        return json.dumps(self.data).encode()
+
+
+class FakeSession:
+    def __init__(self, data, status=HTTPStatus.OK, delay=0):
+        self.data = data
+        self.status = status
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get(self, url, **kwargs):
+        session = self
+
+        class Request(FakeResponse):
+            async def __aenter__(self):
+                session.in_flight += 1
+                session.max_in_flight = max(
+                    session.max_in_flight, session.in_flight
+                )
+                await asyncio.sleep(session.delay)
+                session.in_flight -= 1
+                return self
+
+        return Request(self.status, self.data)
+
+
+class FakeAsyncBot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id=None, text=None, **kwargs):
+        self.sent.append((chat_id, text))
+
+
+class TestAsyncFleet:
+
+    def test_cycle_sends_to_every_subscription(
+            self, random_timestamp, data_with_new_hw_status
+    ):
+        import async_fleet
+        import fleet
+        registry = fleet.SubscriptionRegistry()
+        for chat_id in range(5):
+            registry.add(f'token{chat_id}', chat_id, timestamp=0)
+        bot = FakeAsyncBot()
+
+        async def run():
+            poller = async_fleet.AsyncFleetPoller(
+                bot, FakeSession(data_with_new_hw_status), registry
+            )
+            await poller.run_cycle()
+
+        asyncio.run(run())
+        assert sorted(chat_id for chat_id, _ in bot.sent) == list(range(5))
+        assert all(s.timestamp == random_timestamp for s in registry)
+
+    def test_api_concurrency_is_limited(self):
+        import async_fleet
+        import fleet
+        registry = fleet.SubscriptionRegistry()
+        for chat_id in range(20):
+            registry.add(f'token{chat_id}', chat_id, timestamp=0)
+        session = FakeSession({'homeworks': [], 'current_date': 1}, delay=0.01)
+
+        async def run():
+            poller = async_fleet.AsyncFleetPoller(
+                FakeAsyncBot(), session, registry, api_concurrency=3
+            )
+            await poller.run_cycle()
+
+        asyncio.run(run())
+        assert session.max_in_flight == 3, (
+            'Число одновременных запросов к api-сервису должно '
+            'ограничиваться.'
+        )
+
+    def test_not_ok_status_sends_error(self):
+        import async_fleet
+        import fleet
+        registry = fleet.SubscriptionRegistry()
+        registry.add('token', 1, timestamp=0)
+        bot = FakeAsyncBot()
+
+        async def run():
+            poller = async_fleet.AsyncFleetPoller(
+                bot, FakeSession({}, status=HTTPStatus.BAD_GATEWAY), registry
+            )
+            await poller.run_cycle()
+            await poller.run_cycle()
+
+        asyncio.run(run())
+        assert len(bot.sent) == 1
+        assert bot.sent[0][1].startswith('Сбой в работе программы')
+
+    def test_store_is_not_used_on_event_loop(self, data_with_new_hw_status):
+        import threading
+
+        import async_fleet
+        import fleet
+        from state import StateStore
+        registry = fleet.SubscriptionRegistry()
+        registry.add('token', 1, timestamp=0)
+        store_threads = []
+
+        class RecordingStore(StateStore):
+            def save_checkpoint(self, *args):
+                store_threads.append(threading.current_thread())
+                return super().save_checkpoint(*args)
+
+            def save_statuses(self, *args):
+                store_threads.append(threading.current_thread())
+                return super().save_statuses(*args)
+
+        async def run():
+            poller = async_fleet.AsyncFleetPoller(
+                FakeAsyncBot(), FakeSession(data_with_new_hw_status),
+                registry, store=RecordingStore()
+            )
+            await poller.run_cycle()
+
+        asyncio.run(run())
+        assert len(store_threads) == 2
+        assert threading.main_thread() not in store_threads, (
+            'Запись в хранилище не должна блокировать цикл событий.'
+        )
+
+    def test_main_polls_only_its_shard(self, monkeypatch, tmp_path):
+        from functools import partial
+
+        import async_fleet
+        import sharding
+        path = tmp_path / 'subscribers.json'
+        path.write_text(json.dumps([
+            {'token': f'token{index}', 'chat_id': index}
+            for index in range(20)
+        ]))
+        polled = []
+
+        async def run(registry, store):
+            polled.extend(subscription.token for subscription in registry)
+
+        monkeypatch.setattr(async_fleet, 'SUBSCRIBERS_FILE', str(path))
+        monkeypatch.setattr(async_fleet, 'run', run)
+        monkeypatch.setattr(async_fleet, 'select_shard', partial(
+            sharding.select_shard, shard=1, count=2
+        ))
+        async_fleet.main()
+        assert polled and len(polled) < 20, (
+            'Асинхронный опрос должен опрашивать только подписки своего '
+            'шарда.'
+        )
+        assert all(
+            sharding.shard_for(token, range(2)) == 1 for token in polled
+        )
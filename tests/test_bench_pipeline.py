@@ -0,0 +1,41 @@
+class TestBenchPipeline:
+
+    def test_run_reports_every_stage(self):
+        from benchmarks import bench_pipeline
+        results = bench_pipeline.run(sizes=[1, 3], subscribers=2, repeats=2)
+        stages = {(row['stage'], row['homeworks']) for row in results}
+        assert ('full_cycle', 3) in stages
+        assert ('fleet_cycle', 1) in stages
+        for row in results:
+            assert row['p50_ms'] <= row['p99_ms']
+            assert row['calls_per_sec'] > 0
+
+    def test_api_response_size(self):
+        from benchmarks import bench_pipeline
+        data = bench_pipeline.make_api_response(7)
+        assert len(data['homeworks']) == 7
+        assert {hw['status'] for hw in data['homeworks']} == set(
+            bench_pipeline.STATUSES
+        )
+
+    def test_fleet_cycle_parses_and_sends_every_pass(self):
+        import requests
+
+        import metrics
+        from benchmarks import bench_pipeline
+        from response_cache import CACHE_HITS
+        original_get = requests.get
+        try:
+            for changing, sent_per_pass in ((True, 2), (False, 0)):
+                cycle = bench_pipeline.fleet_cycle(2, 1, changing)
+                cycle()
+                cycle()
+                sent = metrics.MESSAGES_SENT.value()
+                hits = CACHE_HITS.value(reason='same_body')
+                cycle()
+                assert metrics.MESSAGES_SENT.value() - sent == sent_per_pass
+                assert CACHE_HITS.value(reason='same_body') - hits == (
+                    0 if changing else 2
+                ), 'Проход fleet_cycle не должен попадать в кэш ответов.'
+        finally:
+            requests.get = original_get
@@ -0,0 +1,75 @@
+import requests
+import telebot
+
+import tests.check_utils as check_utils
+
+
+def homework(homework_id, status, **fields):
+    return dict(id=homework_id, homework_name=f'hw{homework_id}.zip',
+                status=status, **fields)
+
+
+class TestChangeDetector:
+
+    def test_only_transitions_are_changes(self):
+        from changes import ChangeDetector
+        detector = ChangeDetector()
+        first = [homework(1, 'reviewing')]
+        assert detector.changes('owner', first) == first, (
+            'Впервые увиденная работа должна считаться изменением.'
+        )
+        detector.commit('owner', first)
+        assert detector.changes('owner', [
+            homework(1, 'reviewing', date_updated='2021-04-11T10:31:09Z')
+        ]) == [], 'Изменение других полей не должно давать сообщения.'
+        approved = [homework(1, 'approved')]
+        assert detector.changes('owner', approved) == approved
+        assert detector.changes('other', first) == first, (
+            'Статусы разных владельцев не должны смешиваться.'
+        )
+
+    def test_replayed_item_is_counted_once(self):
+        from changes import ChangeDetector
+        detector = ChangeDetector()
+        homeworks = [homework(1, 'approved'), homework(1, 'reviewing')]
+        assert detector.changes('owner', homeworks) == homeworks[:1]
+
+    def test_statuses_are_persisted(self):
+        from changes import ChangeDetector
+        from state import StateStore
+        store = StateStore()
+        ChangeDetector(store).commit('owner', [homework(1, 'reviewing')])
+        detector = ChangeDetector(store)
+        assert detector.changes('owner', [homework(1, 'reviewing')]) == [], (
+            'Статусы должны восстанавливаться из хранилища.'
+        )
+        assert detector.changes('owner', [homework(1, 'approved')])
+
+    def test_main_does_not_repeat_unchanged_status(
+            self, monkeypatch, data_with_new_hw_status, homework_module
+    ):
+        sent = []
+        monkeypatch.setattr(
+            requests, 'get',
+            check_utils.mock_get_with_data(data_with_new_hw_status)
+        )
+        monkeypatch.setattr(
+            homework_module, 'send_message',
+            lambda bot, message: sent.append(message)
+        )
+        sleeps = []
+
+        def sleep(delay):
+            sleeps.append(delay)
+            if len(sleeps) == 3:
+                raise check_utils.BreakInfiniteLoop
+
+        monkeypatch.setattr(homework_module.time, 'sleep', sleep)
+        monkeypatch.setattr(telebot, 'TeleBot', check_utils.MockTelegramBot)
+        try:
+            homework_module.main()
+        except check_utils.BreakInfiniteLoop:
+            pass
+        assert len(sent) == 1, (
+            'Сообщение о неизменившемся статусе не должно повторяться.'
+        )
@@ -0,0 +1,157 @@
+from http import HTTPStatus
+
+import pytest
+import requests
+
+import tests.check_utils as check_utils
+
+
+def failing(error):
+    def func():
+        raise error
+    return func
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold_and_fails_fast(self, clock):
+        from circuit_breaker import OPEN, CircuitBreaker
+        from exceptions import ApiIsDown, CircuitIsOpen
+        breaker = CircuitBreaker(threshold=2, base_delay=10, jitter=0,
+                                 clock=clock)
+        calls = []
+
+        def func():
+            calls.append(1)
+            raise ApiIsDown('down')
+
+        for _ in range(2):
+            with pytest.raises(ApiIsDown):
+                breaker.call(func)
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitIsOpen):
+            breaker.call(func)
+        assert len(calls) == 2, (
+            'Разомкнутый предохранитель не должен пропускать запросы.'
+        )
+
+    def test_half_open_probe_closes_or_reopens(self, clock):
+        from circuit_breaker import CLOSED, HALF_OPEN, CircuitBreaker
+        from exceptions import ApiIsDown, CircuitIsOpen
+        breaker = CircuitBreaker(threshold=1, base_delay=10, jitter=0,
+                                 clock=clock)
+        with pytest.raises(ApiIsDown):
+            breaker.call(failing(ApiIsDown('down')))
+        clock.now = 10
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(ApiIsDown):
+            breaker.call(failing(ApiIsDown('down')))
+        assert breaker.open_until == 30, (
+            'Повторное размыкание должно удваивать паузу.'
+        )
+        clock.now = 29
+        with pytest.raises(CircuitIsOpen):
+            breaker.call(lambda: 'ok')
+        clock.now = 30
+        assert breaker.call(lambda: 'ok') == 'ok'
+        assert breaker.state == CLOSED
+
+    def test_retry_after_is_honored(self, clock):
+        from circuit_breaker import OPEN, CircuitBreaker
+        from exceptions import ApiRateLimited
+        breaker = CircuitBreaker(threshold=5, base_delay=10, jitter=0,
+                                 clock=clock)
+        with pytest.raises(ApiRateLimited):
+            breaker.call(failing(ApiRateLimited('429', retry_after=120)))
+        assert breaker.state == OPEN
+        assert breaker.open_until == 120
+
+    def test_short_retry_after_overrides_backoff(self, clock):
+        from circuit_breaker import CLOSED, CircuitBreaker
+        from exceptions import ApiRateLimited, CircuitIsOpen
+        breaker = CircuitBreaker(threshold=5, base_delay=30, jitter=0,
+                                 clock=clock)
+        with pytest.raises(ApiRateLimited):
+            breaker.call(failing(ApiRateLimited('429', retry_after=1)))
+        with pytest.raises(CircuitIsOpen):
+            breaker.call(lambda: 'ok')
+        clock.now = 1
+        assert breaker.call(lambda: 'ok') == 'ok', (
+            'Короткий Retry-After не должен заменяться base_delay.'
+        )
+        assert breaker.state == CLOSED
+
+    def test_shared_breaker_ignores_rate_limits(self):
+        from circuit_breaker import CLOSED, CircuitBreaker
+        from exceptions import ApiRateLimited
+        breaker = CircuitBreaker(threshold=1, trip_on_rate_limit=False)
+        with pytest.raises(ApiRateLimited):
+            breaker.call(failing(ApiRateLimited('429', retry_after=60)))
+        assert breaker.state == CLOSED
+
+    def test_client_errors_do_not_trip(self):
+        from circuit_breaker import CLOSED, CircuitBreaker
+        from exceptions import ApiIsNotReachable
+        breaker = CircuitBreaker(threshold=1)
+        with pytest.raises(ApiIsNotReachable):
+            breaker.call(failing(ApiIsNotReachable('401')))
+        assert breaker.state == CLOSED
+
+    def test_parse_retry_after(self):
+        from circuit_breaker import parse_retry_after
+        assert parse_retry_after('120') == 120
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT',
+                                 now=1445412480 - 60) == 60
+
+    def test_rate_limited_response(self, monkeypatch, homework_module):
+        from exceptions import ApiRateLimited
+
+        class RateLimitedResponse(check_utils.MockResponseGET):
+            headers = {'Retry-After': '30'}
+
+        def mocked_response(*args, **kwargs):
+            return RateLimitedResponse(
+                *args, http_status=HTTPStatus.TOO_MANY_REQUESTS, **kwargs
+            )
+
+        monkeypatch.setattr(requests, 'get', mocked_response)
+        with pytest.raises(ApiRateLimited) as error:
+            homework_module.get_api_answer(0)
+        assert error.value.retry_after == 30
+
+
+class TestRateLimits:
+
+    def test_pause_is_per_token(self, clock):
+        from circuit_breaker import RateLimits
+        from exceptions import CircuitIsOpen
+        limits = RateLimits(default_delay=30, clock=clock)
+        limits.record('t1', retry_after=2)
+        with pytest.raises(CircuitIsOpen):
+            limits.check('t1')
+        limits.check('t2')
+        clock.now = 2
+        limits.check('t1')
+        assert len(limits) == 0
+
+    def test_fleet_rate_limit_does_not_stop_other_tokens(self, monkeypatch):
+        import fleet
+        from exceptions import ApiRateLimited, CircuitIsOpen
+
+        def request(headers, timestamp, *args):
+            if 't1' in headers['Authorization']:
+                raise ApiRateLimited('429', retry_after=60)
+            return {'homeworks': [], 'current_date': 1}
+
+        monkeypatch.setattr(fleet, 'request_homework_statuses', request)
+        poller = fleet.FleetPoller(None, fleet.SubscriptionRegistry(),
+                                   session=object())
+        for index in range(3):
+            with pytest.raises(ApiRateLimited):
+                poller.fetch(f't1-{index}', 1)
+        with pytest.raises(CircuitIsOpen):
+            poller.fetch('t1-0', 1)
+        assert poller.fetch('t2', 1)['current_date'] == 1, (
+            '429 других токенов не должен останавливать опрос токена.'
+        )
@@ -0,0 +1,80 @@
+import threading
+import time
+
+
+def api_response(*statuses):
+    return {
+        'homeworks': [
+            dict(id=index, homework_name=f'hw{index}.zip', status=status)
+            for index, status in enumerate(statuses)
+        ],
+        'current_date': 1
+    }
+
+
+class TestStatusCommand:
+
+    def test_remembered_response_is_used(self, clock):
+        from commands import StatusCommand
+        calls = []
+        command = StatusCommand(lambda: calls.append(1), ttl=60,
+                                clock=clock)
+        command.remember(api_response('approved'))
+        assert 'hw0.zip' in command.reply()
+        assert calls == [], (
+            'Свежий ответ цикла опроса не должен запрашиваться повторно.'
+        )
+
+    def test_stale_response_is_fetched_once(self, clock):
+        from commands import StatusCommand
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return api_response('reviewing')
+
+        command = StatusCommand(fetch, ttl=60, clock=clock)
+        command.remember(api_response('approved'))
+        clock.now = 61
+        threads = [
+            threading.Thread(target=command.reply) for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(calls) == 1, (
+            'Одновременные команды должны ждать один общий запрос.'
+        )
+        assert 'взята на проверку' in command.reply()
+
+    def test_no_homeworks(self, clock):
+        from commands import NO_HOMEWORKS_REPLY, StatusCommand
+        command = StatusCommand(api_response, clock=clock)
+        assert command.reply() == NO_HOMEWORKS_REPLY
+
+
+class TestAnswerStatus:
+
+    def test_foreign_chat_is_ignored(self, clock):
+        from commands import StatusCommand, answer_status
+        commands = {'1': StatusCommand(api_response, clock=clock)}
+        assert answer_status(commands, 2) is None
+        assert answer_status(commands, 1) is not None
+
+    def test_fetch_error_is_reported(self, clock):
+        from commands import StatusCommand, answer_status
+
+        def fetch():
+            raise ConnectionError('нет сети')
+
+        commands = {'1': StatusCommand(fetch, clock=clock)}
+        assert 'нет сети' in answer_status(commands, '1'), (
+            'Ошибка запроса должна попасть в ответ на команду.'
+        )
+
+    def test_disabled_commands_are_not_started(self):
+        from commands import StatusCommand, start_commands
+        commands = {'1': StatusCommand(api_response)}
+        assert start_commands(commands, enabled=False) is None
@@ -0,0 +1,82 @@
+import inspect
+import os
+import signal
+
+from circuit_breaker import CircuitBreaker
+from exceptions import ApiIsDown, NoHomeworkInResponse
+
+
+class TestErrorAggregator:
+
+    def test_repeats_inside_window_are_suppressed(self, clock):
+        from error_aggregator import ErrorAggregator
+        errors = ErrorAggregator(window=60, summary_period=600, clock=clock)
+        for _ in range(3):
+            errors.record(ApiIsDown('a'))
+            errors.record(NoHomeworkInResponse('b'))
+        assert errors.pending() == [
+            'Сбой в работе программы: a.', 'Сбой в работе программы: b.'
+        ], 'О каждом классе сбоя должно быть одно уведомление.'
+        clock.now = 61
+        errors.record(ApiIsDown('c'))
+        assert errors.pending() == ['Сбой в работе программы: c.'], (
+            'После окна сбой того же класса должен снова уведомляться.'
+        )
+
+    def test_summary_counts_suppressed_errors(self, clock):
+        from error_aggregator import ErrorAggregator
+        errors = ErrorAggregator(window=600, summary_period=60, clock=clock)
+        for _ in range(4):
+            errors.record(ApiIsDown('a'))
+        errors.record(NoHomeworkInResponse('b'))
+        errors.record(NoHomeworkInResponse('b'))
+        errors.pending()
+        clock.now = 60
+        summary, = errors.pending()
+        assert summary.splitlines()[1:] == [
+            'ApiIsDown: 3', 'NoHomeworkInResponse: 1'
+        ]
+        clock.now = 120
+        assert errors.pending() == [], (
+            'Пустая сводка не должна отправляться.'
+        )
+
+    def test_last_message_is_not_repeated_after_restart(self, clock):
+        from error_aggregator import ErrorAggregator
+        errors = ErrorAggregator(
+            last_message='Сбой в работе программы: a.', clock=clock
+        )
+        assert not errors.record(ApiIsDown('a'))
+        assert errors.pending() == []
+
+
+class TestMainErrorNotices:
+
+    def test_alternating_errors_are_sent_once(
+            self, monkeypatch, homework_module
+    ):
+        import time
+        sent = []
+        failures = [ApiIsDown('a'), NoHomeworkInResponse('b')]
+        sleeps = []
+
+        def get_api_answer(timestamp):
+            raise failures[len(sleeps) % 2]
+
+        def sleep(delay):
+            sleeps.append(delay)
+            if len(sleeps) == 6:
+                os.kill(os.getpid(), signal.SIGTERM)
+
+        monkeypatch.setattr(homework_module, 'get_api_answer', get_api_answer)
+        monkeypatch.setattr(
+            homework_module, 'send_message',
+            lambda bot, message: sent.append(message)
+        )
+        monkeypatch.setattr(time, 'sleep', sleep)
+        breaker = CircuitBreaker(threshold=100)
+        monkeypatch.setattr(homework_module, 'CircuitBreaker', lambda: breaker)
+        inspect.unwrap(homework_module.main)()
+        assert sent == [
+            'Сбой в работе программы: a.', 'Сбой в работе программы: b.'
+        ], 'Чередующиеся сбои не должны отправляться каждый цикл.'
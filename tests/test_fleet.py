@@ -0,0 +1,211 @@
+import json
+from http import HTTPStatus
+
+import requests
+
+import tests.check_utils as check_utils
+
+
+class TestFleet:
+
+    def test_registry_from_file(self, tmp_path):
+        import fleet
+        path = tmp_path / 'subscribers.json'
+        path.write_text(json.dumps([
+            {'token': 't1', 'chat_id': 1},
+            {'token': 't2', 'chat_id': 2, 'timestamp': 100},
+            {'token': 't1', 'chat_id': 3},
+        ]))
+        registry = fleet.SubscriptionRegistry.from_file(path)
+        assert len(registry) == 2, (
+            'Повторный токен не должен создавать новую подписку.'
+        )
+        assert registry.get('t1').chat_id == 3
+        assert registry.get('t2').timestamp == 100
+
+    def test_poll_sends_to_subscription_chat(
+            self, monkeypatch, random_timestamp, data_with_new_hw_status
+    ):
+        import fleet
+        calls = []
+        monkeypatch.setattr(
+            requests, 'get', check_utils.mock_get_with_data(
+                data_with_new_hw_status, calls=calls
+            )
+        )
+        registry = fleet.SubscriptionRegistry()
+        subscription = registry.add('sometoken', 42, timestamp=0)
+        bot = check_utils.MockTelegramBot()
+        fleet.FleetPoller(
+            bot, registry, session=requests
+        ).poll(subscription)
+
+        assert calls[0]['headers']['Authorization'] == 'OAuth sometoken'
+        assert bot.chat_id == 42, (
+            'Сообщение должно уходить в чат подписки.'
+        )
+        assert subscription.timestamp == random_timestamp
+
+    def test_service_unavailable_opens_shared_breaker(self, monkeypatch):
+        import fleet
+        from circuit_breaker import OPEN, CircuitBreaker
+        calls = []
+        monkeypatch.setattr(
+            requests, 'get', check_utils.mock_get_with_data(
+                {}, http_status=HTTPStatus.SERVICE_UNAVAILABLE, calls=calls
+            )
+        )
+        registry = fleet.SubscriptionRegistry()
+        for index in range(50):
+            registry.add(f'token{index}', index, timestamp=0)
+        poller = fleet.FleetPoller(
+            check_utils.MockTelegramBot(), registry, session=requests,
+            breaker=CircuitBreaker(threshold=3, trip_on_rate_limit=False)
+        )
+        for subscription in registry:
+            poller.poll(subscription)
+        assert poller.breaker.state == OPEN
+        assert len(calls) == 3, (
+            'Ответы 503 должны размыкать общий предохранитель.'
+        )
+
+    def test_poll_error_message_is_not_repeated(self, monkeypatch):
+        import fleet
+        monkeypatch.setattr(
+            requests, 'get',
+            check_utils.mock_get_with_data(
+                {}, http_status=HTTPStatus.BAD_GATEWAY
+            )
+        )
+        registry = fleet.SubscriptionRegistry()
+        subscription = registry.add('sometoken', 42, timestamp=0)
+        sent = []
+
+        class Bot(check_utils.MockTelegramBot):
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                sent.append(text)
+
+        poller = fleet.FleetPoller(Bot(), registry, session=requests)
+        poller.poll(subscription)
+        poller.poll(subscription)
+        assert len(sent) == 1, (
+            'Одинаковое сообщение об ошибке не должно отправляться повторно.'
+        )
+
+    def test_unknown_status_does_not_block_subscription(self, monkeypatch):
+        import fleet
+        data = {
+            'homeworks': [
+                {'id': 1, 'homework_name': 'hw1.zip', 'status': 'unknown'},
+                {'id': 2, 'homework_name': 'hw2.zip', 'status': 'approved'},
+            ],
+            'current_date': 100,
+        }
+        monkeypatch.setattr(
+            requests, 'get', check_utils.mock_get_with_data(data)
+        )
+        registry = fleet.SubscriptionRegistry()
+        subscription = registry.add('sometoken', 1, timestamp=0)
+        sent = []
+
+        class Bot(check_utils.MockTelegramBot):
+            def send_message(self, chat_id=None, text=None, **kwargs):
+                sent.append(text)
+
+        fleet.FleetPoller(Bot(), registry, session=requests).poll(
+            subscription
+        )
+
+        assert 'hw2.zip' in sent[0], (
+            'Изменения остальных работ должны отправляться.'
+        )
+        assert sent[1].startswith('Сбой в работе программы')
+        assert subscription.timestamp == 100, (
+            'Работа с неожиданным статусом не должна останавливать опрос '
+            'подписки.'
+        )
+
+    def test_run_pending_polls_only_due(self, monkeypatch):
+        import fleet
+        registry = fleet.SubscriptionRegistry()
+        for token in ('a', 'b', 'c', 'd'):
+            registry.add(token, token)
+        polled = []
+        poller = fleet.FleetPoller(None, registry, period=100)
+        monkeypatch.setattr(
+            poller, 'poll', lambda subscription: polled.append(
+                subscription.token)
+        )
+        poller.schedule_all(now=0)
+        poller.run_pending(now=30)
+        assert polled == ['a', 'b'], (
+            'Опросы подписок должны быть распределены по периоду.'
+        )
+
+    def test_thread_pool_polls_concurrently(self, monkeypatch):
+        import threading
+        import time
+
+        import fleet
+        registry = fleet.SubscriptionRegistry()
+        for token in ('a', 'b', 'c', 'd'):
+            registry.add(token, token)
+        poller = fleet.FleetPoller(None, registry, period=100, threads=4)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def poll(subscription):
+            with lock:
+                active.append(subscription.token)
+                peak.append(len(active))
+            time.sleep(0.1)
+            with lock:
+                active.remove(subscription.token)
+            if subscription.token == 'd':
+                raise RuntimeError('сбой опроса')
+
+        monkeypatch.setattr(poller, 'poll', poll)
+        poller.schedule_all(now=0)
+        started = time.monotonic()
+        poller.run_pending(now=100)
+        poller.close()
+        assert time.monotonic() - started < 0.3, (
+            'В режиме пула подписки должны опрашиваться параллельно.'
+        )
+        assert max(peak) > 1
+        assert len(poller._queue) == 4, (
+            'Все подписки, включая упавшую, должны быть запланированы снова.'
+        )
+
+    def test_poll_passes_timeout(self, monkeypatch,
+                                 data_with_new_hw_status):
+        import fleet
+        calls = []
+        monkeypatch.setattr(
+            requests, 'get', check_utils.mock_get_with_data(
+                data_with_new_hw_status, calls=calls
+            )
+        )
+        registry = fleet.SubscriptionRegistry()
+        subscription = registry.add('sometoken', 42, timestamp=0)
+        fleet.FleetPoller(
+            check_utils.MockTelegramBot(), registry, session=requests,
+            timeout=5
+        ).poll(subscription)
+        assert calls[0]['timeout'] == 5
+
+    def test_import_does_not_load_telebot(self):
+        import subprocess
+        import sys
+        code = (
+            'import sys, coordinator, fleet, telegram_queue; '
+            'print(any(name.startswith("telebot") for name in sys.modules))'
+        )
+        output = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True,
+            check=True
+        ).stdout
+        assert output.strip() == 'False', (
+            'Модуль telebot должен загружаться только при запуске main().'
+        )
@@ -0,0 +1,53 @@
+class TestHomeworkBatch:
+
+    def test_parse_statuses_removes_duplicates(self, homework_module):
+        homeworks = [
+            {'id': 1, 'homework_name': 'hw1', 'status': 'reviewing'},
+            {'id': 2, 'homework_name': 'hw2', 'status': 'approved'},
+            {'id': 1, 'homework_name': 'hw1', 'status': 'reviewing'},
+            {'id': 1, 'homework_name': 'hw1', 'status': 'rejected'},
+        ]
+        messages = homework_module.parse_statuses(homeworks)
+        assert len(messages) == 3, (
+            'Повторы по id и статусу должны отбрасываться.'
+        )
+        assert 'hw2' in messages[1]
+
+    def test_unknown_status_does_not_abort_batch(self, homework_module):
+        homeworks = [
+            {'id': 1, 'homework_name': 'hw1', 'status': 'unknown'},
+            {'id': 2, 'homework_name': 'hw2', 'status': 'approved'},
+        ]
+        errors = []
+        messages = homework_module.parse_statuses(homeworks, errors.append)
+        assert len(messages) == 1 and 'hw2' in messages[0], (
+            'Работа с неожиданным статусом не должна мешать сообщениям '
+            'об остальных.'
+        )
+        assert [type(error) for error in errors] == [
+            homework_module.WrongHomeworkStatus
+        ]
+
+    def test_join_messages_respects_limit(self, homework_module):
+        messages = ['a' * 40, 'b' * 40, 'c' * 40]
+        texts = homework_module.join_messages(messages, limit=100)
+        assert texts == [f'{"a" * 40}\n{"b" * 40}', 'c' * 40]
+        assert all(len(text) <= 100 for text in texts)
+
+    def test_join_messages_splits_long_message(self, homework_module):
+        texts = homework_module.join_messages(['x' * 250, 'y'], limit=100)
+        assert [len(text) for text in texts] == [100, 100, 52]
+        assert texts[-1] == f'{"x" * 50}\ny'
+
+    def test_batch_combines_homeworks(
+            self, homework_module, data_with_new_hw_status
+    ):
+        homeworks = data_with_new_hw_status['homeworks']
+        homeworks.append(dict(homeworks[0], id=1, homework_name='second',
+                              status='rejected'))
+        messages = homework_module.parse_statuses(homeworks)
+        texts = homework_module.join_messages(messages)
+        assert len(texts) == 1, (
+            'Изменения нескольких работ должны уходить одним сообщением.'
+        )
+        assert 'hw123.zip' in texts[0] and 'second' in texts[0]
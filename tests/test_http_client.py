@@ -0,0 +1,66 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({'homeworks': [], 'current_date': 1}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/'
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpClient:
+
+    def test_connection_is_reused(self, local_server):
+        import http_client
+        session = http_client.create_session()
+        for _ in range(5):
+            session.get(local_server, timeout=1).json()
+        stats = http_client.log_connection_stats(session)
+        assert stats['connections'] == 1, (
+            'Запросы к одному хосту должны идти через одно соединение.'
+        )
+        assert stats['reused'] == 4
+        session.close()
+
+    def test_shared_session(self):
+        import http_client
+        assert http_client.get_session() is http_client.get_session()
+
+    def test_retries_fit_cycle_deadline(self):
+        import http_client
+        connect, status = http_client.retry_limits(
+            retries=2, timeout=(5, 30), deadline=60, backoff_factor=0.5
+        )
+        assert (connect, status) == (2, 0)
+        assert http_client.worst_case_seconds(
+            connect, status, (5, 30), 0.5
+        ) == 46.5
+        retry = http_client.create_session(
+            retries=2, timeout=(5, 30), deadline=60, backoff_factor=0.5
+        ).get_adapter('https://').max_retries
+        assert retry.read == 0, 'Таймаут чтения не должен повторяться.'
+        assert http_client.retry_limits(
+            retries=2, timeout=(1, 2), deadline=60
+        ) == (2, 2)
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+
+class TestJsonDecoder:
+
+    def test_homeworks_become_records(self, data_with_new_hw_status):
+        from json_decoder import decode_api_response
+        from models import Homework
+        body = json.dumps(data_with_new_hw_status).encode()
+        api_response = decode_api_response(body)
+        homework = api_response['homeworks'][0]
+        assert isinstance(homework, Homework), (
+            'Работы из ответа должны разбираться в записи Homework.'
+        )
+        assert homework['status'] == (
+            data_with_new_hw_status['homeworks'][0]['status']
+        ), 'Запись Homework должна содержать статус работы из ответа.'
+        assert api_response['current_date'] == (
+            data_with_new_hw_status['current_date']
+        )
+
+    def test_parse_status_accepts_records(self, homework_module,
+                                          data_with_new_hw_status):
+        from json_decoder import to_records
+        expected = homework_module.parse_status(
+            data_with_new_hw_status['homeworks'][0]
+        )
+        records = to_records(data_with_new_hw_status)['homeworks']
+        assert homework_module.parse_status(records[0]) == expected, (
+            'parse_status должна одинаково разбирать dict и Homework.'
+        )
+
+    @pytest.mark.parametrize('body, error', [
+        (b'[]', 'TypeError'),
+        (b'{"current_date": 1}', 'NoHomeworkInResponse'),
+        (b'{"homeworks": {}, "current_date": 1}', 'TypeError'),
+    ])
+    def test_bad_shapes_keep_check_response_errors(self, homework_module,
+                                                   body, error):
+        from json_decoder import decode_api_response
+        error = getattr(homework_module, error, TypeError)
+        with pytest.raises(error):
+            homework_module.check_response(decode_api_response(body))
+
+    @pytest.mark.parametrize('name', ['json', 'unknown'])
+    def test_stdlib_fallback(self, name):
+        from json_decoder import select_loads
+        assert select_loads(name) is json.loads
@@ -0,0 +1,94 @@
+import json
+import logging
+
+
+class TestLogConfig:
+
+    def test_json_formatter(self):
+        from log_config import JsonFormatter
+        record = logging.LogRecord(
+            'homework', logging.DEBUG, __file__, 10,
+            'Отправка сообщения "%s"', ('текст',), None
+        )
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry['message'] == 'Отправка сообщения "текст"'
+        assert entry['level'] == 'DEBUG'
+
+    def test_queue_mode_writes_from_listener(self, capsys):
+        from log_config import configure_logger, stop_listener
+        logger = logging.getLogger('homework_test_queue')
+        logger.propagate = False
+        listener = configure_logger(logger, mode='queue', log_format='json')
+        try:
+            logger.debug('Запрос %s', 1)
+        finally:
+            stop_listener(listener)
+            logger.handlers.clear()
+        lines = capsys.readouterr().out.splitlines()
+        assert json.loads(lines[-1])['message'] == 'Запрос 1'
+
+    def test_queue_mode_keeps_exc_info_for_json(self, capsys):
+        from log_config import configure_logger, stop_listener
+        logger = logging.getLogger('homework_test_queue_exc')
+        logger.propagate = False
+        listener = configure_logger(logger, mode='queue', log_format='json')
+        try:
+            try:
+                raise ValueError('OAuth y0_AgAAAAsecret')
+            except ValueError as error:
+                logger.error('Сбой %s', 1, exc_info=error)
+        finally:
+            stop_listener(listener)
+            logger.handlers.clear()
+        entry = json.loads(capsys.readouterr().out.splitlines()[-1])
+        assert entry['message'] == 'Сбой 1', (
+            'Traceback не должен попадать в message.'
+        )
+        assert 'ValueError' in entry['exc_info']
+        assert 'y0_AgAAAAsecret' not in entry['exc_info']
+
+    def test_sync_mode(self, capsys):
+        from log_config import configure_logger
+        logger = logging.getLogger('homework_test_sync')
+        logger.propagate = False
+        assert configure_logger(logger, mode='sync', level='INFO') is None
+        logger.debug('не выводится')
+        logger.info('выводится')
+        logger.handlers.clear()
+        out = capsys.readouterr().out
+        assert 'выводится' in out and 'не выводится' not in out
+
+    def test_secrets_are_redacted(self):
+        from log_config import RedactingFilter
+        token = '1234567890:AAHdqTcvCH1vGWJxfSeofSAs0K5PALDsaw'
+        record = logging.LogRecord(
+            'homework', logging.ERROR, __file__, 10,
+            'headers %s, url %s', (
+                {'Authorization': 'OAuth y0_AgAAAAsecret'},
+                f'https://api.telegram.org/bot{token}/sendMessage'
+            ), None
+        )
+        RedactingFilter().filter(record)
+        message = record.getMessage()
+        assert 'y0_AgAAAAsecret' not in message
+        assert "'OAuth ***'" in message
+        assert token not in message
+
+    def test_request_log_has_no_token(self, caplog, monkeypatch,
+                                      homework_module):
+        import requests
+
+        def fail(*args, **kwargs):
+            raise requests.RequestException('down')
+
+        monkeypatch.setattr(requests, 'get', fail)
+        with caplog.at_level(logging.DEBUG):
+            try:
+                homework_module.get_api_answer(0)
+            except Exception:
+                pass
+        assert caplog.records
+        assert all(
+            homework_module.PRACTICUM_TOKEN not in record.getMessage()
+            for record in caplog.records
+        ), 'Токен практикума не должен попадать в лог.'
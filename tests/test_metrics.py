@@ -0,0 +1,64 @@
+import urllib.request
+from http import HTTPStatus
+
+import requests
+
+import tests.check_utils as check_utils
+
+
+class TestMetrics:
+
+    def test_render_counter_and_histogram(self):
+        import metrics
+        registry = metrics.Registry()
+        counter = registry.register(
+            metrics.Counter('test_total', 'Счётчик.', ('code',))
+        )
+        histogram = registry.register(
+            metrics.Histogram('test_seconds', 'Гистограмма.', buckets=(1, 5))
+        )
+        counter.inc(code=200)
+        counter.inc(2, code=200)
+        histogram.observe(0.5)
+        histogram.observe(3)
+        text = registry.render()
+        assert '# TYPE test_total counter' in text
+        assert 'test_total{code="200"} 3' in text
+        assert 'test_seconds_bucket{le="1.0"} 1' in text
+        assert 'test_seconds_bucket{le="5.0"} 2' in text
+        assert 'test_seconds_bucket{le="+Inf"} 2' in text
+        assert 'test_seconds_sum 3.5' in text
+
+    def test_http_endpoint(self):
+        import metrics
+        server = metrics.start_http_server(0, host='127.0.0.1')
+        try:
+            with urllib.request.urlopen(
+                    f'http://127.0.0.1:{server.server_port}/metrics',
+                    timeout=1) as response:
+                body = response.read().decode()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert 'homework_api_request_seconds' in body
+
+    def test_textfile(self, tmp_path):
+        import metrics
+        path = tmp_path / 'homework.prom'
+        metrics.write_textfile(str(path))
+        assert 'homework_cycle_seconds' in path.read_text()
+
+    def test_api_request_is_counted(self, monkeypatch, homework_module):
+        import metrics
+
+        def mocked_response(*args, **kwargs):
+            return check_utils.MockResponseGET(
+                *args, http_status=HTTPStatus.OK, **kwargs
+            )
+
+        monkeypatch.setattr(requests, 'get', mocked_response)
+        before = metrics.API_RESPONSES.value(code=200)
+        requests_before = metrics.API_REQUEST_SECONDS.count()
+        homework_module.get_api_answer(0)
+        assert metrics.API_RESPONSES.value(code=200) == before + 1
+        assert metrics.API_REQUEST_SECONDS.count() == requests_before + 1
@@ -0,0 +1,58 @@
+import pickle
+import sys
+
+import pytest
+
+
+class TestHomework:
+
+    def test_only_tracked_fields_are_kept(self, data_with_new_hw_status):
+        from models import Homework
+        data = dict(data_with_new_hw_status['homeworks'][0],
+                    reviewer_comment='Всё нравится', lesson_name='Спринт')
+        homework = Homework.from_dict(data)
+        assert 'reviewer_comment' not in homework
+        assert 'lesson_name' not in homework
+        assert homework['homework_name'] == data['homework_name']
+        assert sys.getsizeof(homework) < sys.getsizeof(data), (
+            'Запись Homework должна занимать меньше памяти, чем dict.'
+        )
+
+    def test_status_is_interned(self):
+        from models import Homework, HomeworkStatus
+        homework = Homework.from_dict({'status': 'approved'})
+        assert homework.status is HomeworkStatus.APPROVED
+        assert homework['status'] == 'approved'
+        assert f'{homework.status}' == 'approved', (
+            'Статус должен форматироваться как строка из api-сервиса.'
+        )
+
+    def test_unknown_status_is_kept(self, homework_module):
+        from models import Homework
+        homework = Homework.from_dict(
+            {'homework_name': 'hw.zip', 'status': 'unknown'}
+        )
+        assert homework.status == 'unknown'
+        with pytest.raises(homework_module.WrongHomeworkStatus):
+            homework_module.parse_status(homework)
+
+    def test_missing_field_raises_key_error(self, homework_module):
+        from models import Homework
+        homework = Homework.from_dict({'status': 'approved'})
+        with pytest.raises(KeyError):
+            homework['homework_name']
+        assert homework.get('id') is None
+        with pytest.raises(homework_module.WrongHomeworkStatus):
+            homework_module.parse_status(Homework.from_dict({}))
+
+    def test_record_is_frozen(self):
+        from models import Homework
+        homework = Homework.from_dict({'id': 1, 'status': 'approved'})
+        with pytest.raises(AttributeError):
+            homework.status = 'rejected'
+        with pytest.raises(AttributeError):
+            del homework.id
+        assert hash(homework) == hash(
+            Homework.from_dict({'id': 1, 'status': 'approved'})
+        )
+        assert pickle.loads(pickle.dumps(homework)) == homework
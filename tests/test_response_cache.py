@@ -0,0 +1,85 @@
+import json
+from http import HTTPStatus
+
+import requests
+
+import tests.check_utils as check_utils
+
+
+class ConditionalServer:
+    """Заменитель requests.get, поддерживающий If-None-Match."""
+
+    def __init__(self, data, etag='"v1"'):
+        self.data = data
+        self.etag = etag
+        self.requests = []
+
+    def get(self, *args, headers=None, **kwargs):
+        self.requests.append(dict(headers))
+        status = HTTPStatus.OK
+        if self.etag and headers.get('If-None-Match') == self.etag:
+            status = HTTPStatus.NOT_MODIFIED
+        response = check_utils.MockResponseGET(
+            *args, http_status=status, data=self.data, **kwargs
+        )
+        response.content = json.dumps(self.data).encode()
+        response.headers = {'ETag': self.etag} if self.etag else {}
+        return response
+
+
+class TestResponseCache:
+
+    def test_not_modified_returns_cached(self, monkeypatch, homework_module):
+        from response_cache import ResponseCache
+        server = ConditionalServer({'homeworks': [], 'current_date': 1})
+        monkeypatch.setattr(requests, 'get', server.get)
+        cache = ResponseCache()
+        headers = homework_module.make_headers('sometoken')
+        first = homework_module.request_homework_statuses(
+            headers, 0, cache=cache
+        )
+        second = homework_module.request_homework_statuses(
+            headers, 0, cache=cache
+        )
+        assert server.requests[1]['If-None-Match'] == '"v1"', (
+            'Повторный запрос должен быть условным.'
+        )
+        assert second is first
+
+    def test_same_body_is_not_parsed_again(self, monkeypatch,
+                                           homework_module,
+                                           data_with_new_hw_status):
+        from response_cache import ResponseCache
+        server = ConditionalServer(data_with_new_hw_status, etag=None)
+        monkeypatch.setattr(requests, 'get', server.get)
+        cache = ResponseCache()
+        headers = homework_module.make_headers('sometoken')
+        first = homework_module.request_homework_statuses(
+            headers, 0, cache=cache
+        )
+        homeworks = cache.prepare(first)
+        check_calls = []
+        monkeypatch.setattr(
+            'response_cache.check_response',
+            lambda response: check_calls.append(response) or []
+        )
+        second = homework_module.request_homework_statuses(
+            headers, 0, cache=cache
+        )
+        assert second is first
+        assert cache.prepare(second) is homeworks
+        assert not check_calls, (
+            'Неизменный ответ не должен разбираться повторно.'
+        )
+
+    def test_different_from_date_is_separate_key(self, monkeypatch,
+                                                 homework_module):
+        from response_cache import ResponseCache
+        server = ConditionalServer({'homeworks': [], 'current_date': 1})
+        monkeypatch.setattr(requests, 'get', server.get)
+        cache = ResponseCache(maxsize=1)
+        headers = homework_module.make_headers('sometoken')
+        homework_module.request_homework_statuses(headers, 0, cache=cache)
+        homework_module.request_homework_statuses(headers, 5, cache=cache)
+        assert 'If-None-Match' not in server.requests[1]
+        assert len(cache) == 1
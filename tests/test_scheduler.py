@@ -0,0 +1,42 @@
+class TestScheduler:
+
+    def test_reviewing_polls_faster(self):
+        import scheduler
+        policy = scheduler.AdaptivePolicy(600, fast=120, jitter=0)
+        state = scheduler.PollState()
+        state.observe([{'id': 1, 'status': 'reviewing'}])
+        assert policy.next_delay(state) == 120, (
+            'Пока работа на ревью, опрос должен идти чаще.'
+        )
+        state.observe([])
+        assert policy.next_delay(state) == 120
+        state.observe([{'id': 1, 'status': 'approved'}])
+        assert policy.next_delay(state) == 600
+
+    def test_idle_slows_down_to_maximum(self):
+        import scheduler
+        policy = scheduler.AdaptivePolicy(
+            600, maximum=3000, slowdown_after=2, jitter=0
+        )
+        state = scheduler.PollState()
+        delays = []
+        for _ in range(6):
+            state.observe([])
+            delays.append(policy.next_delay(state))
+        assert delays == [600, 600, 1200, 2400, 3000, 3000], (
+            'При долгом простое интервал должен расти до максимума.'
+        )
+
+    def test_jitter_bounds(self):
+        import scheduler
+        policy = scheduler.AdaptivePolicy(600, jitter=0.1)
+        state = scheduler.PollState()
+        delays = {policy.next_delay(state) for _ in range(50)}
+        assert len(delays) > 1
+        assert all(540 <= delay <= 660 for delay in delays)
+
+    def test_fixed_policy(self):
+        import scheduler
+        state = scheduler.PollState()
+        state.observe([{'status': 'reviewing'}])
+        assert scheduler.FixedPolicy(600).next_delay(state) == 600
@@ -0,0 +1,81 @@
+import multiprocessing
+from collections import Counter
+
+
+def echo_worker(shard, connection):
+    connection.send((shard, connection.recv()))
+
+
+class TestSharding:
+
+    TOKENS = [f'token{index}' for index in range(2000)]
+
+    def test_shards_are_balanced(self):
+        from sharding import shard_for
+        sizes = Counter(shard_for(token, range(4)) for token in self.TOKENS)
+        assert set(sizes) == {0, 1, 2, 3}
+        assert max(sizes.values()) < 1.3 * len(self.TOKENS) / 4, (
+            'Подписки должны делиться между шардами примерно поровну.'
+        )
+
+    def test_new_shard_takes_only_its_share(self):
+        from sharding import shard_for
+        moved = [
+            token for token in self.TOKENS
+            if shard_for(token, range(4)) != shard_for(token, range(5))
+        ]
+        assert all(shard_for(token, range(5)) == 4 for token in moved), (
+            'Подписки должны переезжать только на новый шард.'
+        )
+        assert len(moved) < 1.3 * len(self.TOKENS) / 5
+
+    def test_select_shard_partitions_registry(self):
+        import fleet
+        from sharding import select_shard
+        tokens = set()
+        for shard in range(3):
+            registry = fleet.SubscriptionRegistry()
+            for index, token in enumerate(self.TOKENS[:300]):
+                registry.add(token, index, timestamp=0)
+            selected = {s.token for s in select_shard(registry, shard, 3)}
+            assert not tokens & selected, 'Шарды не должны пересекаться.'
+            tokens |= selected
+        assert tokens == set(self.TOKENS[:300])
+
+    def test_rebalance_restores_checkpoint(self):
+        import fleet
+        from coordinator import rebalance
+        from state import StateStore, owner_key
+        from sharding import shard_for
+        subscribers = fleet.SubscriptionRegistry()
+        for index, token in enumerate(self.TOKENS[:50]):
+            subscribers.add(token, index, timestamp=0)
+        store = StateStore()
+        token = next(t for t in self.TOKENS if shard_for(t, [0, 1]) == 1)
+        store.save_checkpoint(owner_key(token), 777, None)
+        registry = fleet.SubscriptionRegistry()
+        rebalance(registry, subscribers, 1, [0, 1], store)
+        assert registry.get(token).timestamp == 777
+        moved = rebalance(registry, subscribers, 1, [1], store)
+        assert len(registry) == 50
+        assert moved == 50 - len([
+            t for t in self.TOKENS[:50] if shard_for(t, [0, 1]) == 1
+        ])
+
+    def test_coordinator_broadcasts_members_and_reaps(self):
+        from coordinator import Coordinator
+        coordinator = Coordinator(
+            target=echo_worker, context=multiprocessing.get_context('fork')
+        )
+        coordinator.scale(2)
+        replies = sorted(
+            worker.connection.recv()
+            for worker in coordinator._workers.values()
+        )
+        assert replies == [(0, [0, 1]), (1, [0, 1])], (
+            'Каждый процесс должен получить состав шардов.'
+        )
+        for worker in coordinator._workers.values():
+            worker.process.join(1)
+        assert sorted(coordinator.reap()) == [0, 1]
+        assert len(coordinator) == 0
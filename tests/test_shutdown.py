@@ -0,0 +1,94 @@
+import inspect
+import os
+import signal
+import threading
+import time
+
+import pytest
+import requests
+import telebot
+
+import tests.check_utils as check_utils
+
+
+class TestGracefulShutdown:
+
+    def test_signal_interrupts_sleep(self):
+        from shutdown import GracefulShutdown
+        started = time.monotonic()
+        with GracefulShutdown() as shutdown:
+            threading.Timer(
+                0.05, os.kill, (os.getpid(), signal.SIGTERM)
+            ).start()
+            with shutdown.sleeping():
+                time.sleep(5)
+        assert time.monotonic() - started < 1, (
+            'Сигнал остановки должен прерывать паузу между циклами.'
+        )
+
+    def test_signal_during_cycle_stops_before_sleep(self):
+        from exceptions import ShutdownRequested
+        from shutdown import GracefulShutdown
+        shutdown = GracefulShutdown(signals=())
+        shutdown.handle(signal.SIGTERM)
+        assert shutdown.requested
+        with pytest.raises(ShutdownRequested):
+            with shutdown.sleeping():
+                pass
+        with pytest.raises(ShutdownRequested):
+            shutdown.handle(signal.SIGTERM)
+
+    def test_previous_handlers_are_restored(self):
+        from shutdown import GracefulShutdown
+        previous = signal.getsignal(signal.SIGTERM)
+        with GracefulShutdown():
+            assert signal.getsignal(signal.SIGTERM) is not previous
+        assert signal.getsignal(signal.SIGTERM) is previous
+
+    def test_main_finishes_cycle_and_exits(
+            self, monkeypatch, data_with_new_hw_status, homework_module
+    ):
+        sent = []
+
+        def send_message(bot, message):
+            sent.append(message)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+        monkeypatch.setattr(
+            requests, 'get',
+            check_utils.mock_get_with_data(data_with_new_hw_status)
+        )
+        monkeypatch.setattr(homework_module, 'send_message', send_message)
+        monkeypatch.setattr(telebot, 'TeleBot', check_utils.MockTelegramBot)
+        inspect.unwrap(homework_module.main)()
+        assert len(sent) == 1, (
+            'Цикл, во время которого пришёл сигнал, должен завершиться.'
+        )
+
+    @pytest.mark.parametrize('threads', (0, 2))
+    def test_fleet_stops_polling_on_signal(self, threads):
+        import fleet
+        from shutdown import GracefulShutdown
+        registry = fleet.SubscriptionRegistry()
+        for token in 'abcdefghij':
+            registry.add(token, token)
+        shutdown = GracefulShutdown(signals=())
+        poller = fleet.FleetPoller(
+            None, registry, shutdown=shutdown, threads=threads
+        )
+        polled = []
+
+        def poll(subscription):
+            polled.append(subscription.token)
+            shutdown.handle(signal.SIGTERM)
+            time.sleep(0.01)
+
+        poller.poll = poll
+        poller.schedule_all(now=0)
+        try:
+            poller.run_pending(now=poller.period)
+        finally:
+            poller.close()
+        assert 1 <= len(polled) <= max(threads, 1), (
+            'После сигнала остановки новые опросы не должны начинаться.'
+        )
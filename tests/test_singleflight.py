@@ -0,0 +1,138 @@
+import threading
+
+import pytest
+
+
+class NullOutbox:
+
+    def put(self, chat_id, text):
+        return True
+
+
+def run_concurrently(target, count):
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(target()))
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_share_one_result(self):
+        from singleflight import SingleFlight
+        flights = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(1)
+            return {'homeworks': []}
+
+        leader = threading.Thread(target=lambda: flights.do('key', fetch))
+        leader.start()
+        started.wait(1)
+        threading.Timer(0.05, release.set).start()
+        results = run_concurrently(lambda: flights.do('key', fetch), 4)
+        leader.join()
+        assert len(calls) == 1, (
+            'Одновременные вызовы с одним ключом должны выполнять '
+            'функцию один раз.'
+        )
+        assert all(result is results[0] for result in results), (
+            'Ожидающие вызовы должны получать тот же результат.'
+        )
+        assert len(flights) == 0
+
+    def test_different_keys_are_not_shared(self):
+        from singleflight import SingleFlight
+        flights = SingleFlight()
+        assert flights.do(('token', 0), lambda: 1) == 1
+        assert flights.do(('token', 1), lambda: 2) == 2
+
+    def test_finished_call_is_repeated(self):
+        from singleflight import SingleFlight
+        flights = SingleFlight()
+        calls = []
+        flights.do('key', calls.append, 1)
+        flights.do('key', calls.append, 2)
+        assert calls == [1, 2], 'Результат не должен запоминаться.'
+
+    def test_error_is_shared(self):
+        from singleflight import SingleFlight
+        flights = SingleFlight()
+        started = threading.Event()
+        errors = []
+
+        def fetch():
+            started.set()
+            threading.Event().wait(0.05)
+            raise ConnectionError('нет сети')
+
+        def follower():
+            started.wait(1)
+            try:
+                flights.do('key', fetch)
+            except ConnectionError as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=follower)
+        thread.start()
+        with pytest.raises(ConnectionError):
+            flights.do('key', fetch)
+        thread.join()
+        assert len(errors) == 1, 'Ошибка должна доставаться ожидающим.'
+
+
+class TestFleetFetch:
+
+    def test_status_command_joins_scheduled_poll(self, monkeypatch):
+        import fleet
+        from commands import answer_status
+        from fleet import FleetPoller, SubscriptionRegistry
+        requested = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def request(headers, timestamp, *args):
+            calls.append(timestamp)
+            requested.set()
+            release.wait(1)
+            return {
+                'homeworks': [dict(id=1, homework_name='hw.zip',
+                                   status='approved')],
+                'current_date': timestamp + 1
+            }
+
+        monkeypatch.setattr(fleet, 'request_homework_statuses', request)
+        registry = SubscriptionRegistry()
+        subscription = registry.add('token', 1, timestamp=1000)
+        poller = FleetPoller(None, registry, session=object(),
+                             outbox=NullOutbox())
+        commands = poller.status_commands()
+        poller.commands['token'].remember({
+            'homeworks': [dict(id=1, homework_name='hw.zip',
+                               status='reviewing')],
+            'current_date': 1000
+        })
+        poller.commands['token'].ttl = 0
+        scheduled = threading.Thread(target=poller.poll, args=(subscription,))
+        scheduled.start()
+        requested.wait(1)
+        threading.Timer(0.05, release.set).start()
+        reply = answer_status(commands, 1)
+        scheduled.join()
+        assert calls == [1000], (
+            '/status во время планового опроса того же токена должен '
+            'дождаться его запроса.'
+        )
+        assert 'понравилось' in reply
+        assert subscription.timestamp == 1001
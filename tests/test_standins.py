@@ -0,0 +1,107 @@
+import argparse
+
+import pytest
+import requests
+
+
+def standin_args(**overrides):
+    from benchmarks import standins
+    parser = argparse.ArgumentParser()
+    standins.add_arguments(parser)
+    args = parser.parse_args([])
+    for name, value in overrides.items():
+        setattr(args, name, value)
+    return args
+
+
+@pytest.fixture
+def servers():
+    from benchmarks import standins
+    practicum, telegram = standins.start_servers(standin_args())
+    yield practicum, telegram
+    practicum.stop()
+    telegram.stop()
+
+
+class TestPracticumStandin:
+
+    def test_full_and_incremental_responses(self, servers, monkeypatch):
+        import homework
+        from homework import make_headers, request_homework_statuses
+        practicum, _ = servers
+        practicum.change_rate = 0
+        monkeypatch.setattr(homework, 'ENDPOINT', practicum.endpoint)
+        with requests.Session() as session:
+            full = request_homework_statuses(make_headers('t'), 0, session)
+            later = request_homework_statuses(
+                make_headers('t'), full['current_date'], session
+            )
+        assert len(full['homeworks']) == 3
+        assert later['homeworks'] == [], (
+            'Без изменений ответ с from_date должен быть пустым.'
+        )
+        assert practicum.stats['homework_statuses', 200] == 2
+
+    def test_rate_limit_has_retry_after(self, servers, monkeypatch):
+        import homework
+        from exceptions import ApiRateLimited
+        from homework import make_headers, request_homework_statuses
+        practicum, _ = servers
+        practicum.faults.rate_limit_rate = 1
+        practicum.faults.retry_after = 7
+        monkeypatch.setattr(homework, 'ENDPOINT', practicum.endpoint)
+        with requests.Session() as session:
+            with pytest.raises(ApiRateLimited) as error:
+                request_homework_statuses(make_headers('t'), 0, session)
+        assert error.value.retry_after == 7
+
+
+class TestTelegramStandin:
+
+    def test_send_message(self, servers, monkeypatch):
+        from telebot import TeleBot, apihelper
+
+        import homework
+        _, telegram = servers
+        monkeypatch.setattr(apihelper, 'API_URL', apihelper.API_URL)
+        homework.use_telegram_api(telegram.url)
+        message = TeleBot(token='0:standin').send_message(42, 'привет')
+        assert message.chat.id == 42 and message.text == 'привет'
+        assert telegram.stats['sendMessage', 200] == 1
+
+    def test_flood_limit(self, servers, monkeypatch):
+        from telebot import TeleBot, apihelper
+
+        import homework
+        from telegram_queue import retry_after
+        _, telegram = servers
+        telegram.max_rate = 1
+        monkeypatch.setattr(apihelper, 'API_URL', apihelper.API_URL)
+        homework.use_telegram_api(telegram.url)
+        bot = TeleBot(token='0:standin')
+        bot.send_message(1, 'первое')
+        with pytest.raises(apihelper.ApiTelegramException) as error:
+            bot.send_message(1, 'второе')
+        assert retry_after(error.value) == 1, (
+            'Превышение лимита должно отвечать 429 с retry_after.'
+        )
+
+
+class TestLoadTest:
+
+    def test_run_reports_traffic(self):
+        from telebot import apihelper
+
+        import homework
+        from benchmarks import load_test
+        endpoint, api_url = homework.ENDPOINT, apihelper.API_URL
+        args = standin_args(
+            subscribers=3, duration=0.3, period=0.1, threads=2,
+            global_rate=30, drain=1
+        )
+        result = load_test.run(args)
+        assert result['api_requests'] >= 3
+        assert result['messages_sent'] >= 3, (
+            'Первый опрос каждой подписки должен дойти до телеграма.'
+        )
+        assert (homework.ENDPOINT, apihelper.API_URL) == (endpoint, api_url)
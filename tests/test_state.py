@@ -0,0 +1,51 @@
+class TestStateStore:
+
+    def test_checkpoint_survives_restart(self, tmp_path):
+        import state
+        path = str(tmp_path / 'state.db')
+        store = state.StateStore(path)
+        owner = state.owner_key('sometoken')
+        assert store.load(owner) == state.EMPTY_CHECKPOINT
+        store.save_checkpoint(owner, 1000, 'Сбой в работе программы: x.')
+        store.save_statuses(owner, {1: 'reviewing', 2: 'approved'})
+        store.close()
+
+        restored = state.StateStore(path)
+        checkpoint = restored.load(owner)
+        assert checkpoint.current_date == 1000, (
+            'current_date должен переживать перезапуск бота.'
+        )
+        assert checkpoint.last_error == 'Сбой в работе программы: x.'
+        assert restored.get_status(owner, 1) == 'reviewing'
+        assert restored.get_status(owner, 3) is None
+        restored.close()
+
+    def test_unchanged_checkpoint_is_not_written(self):
+        import state
+        store = state.StateStore()
+        owner = state.owner_key('sometoken')
+        store.load(owner)
+        assert store.save_checkpoint(owner, 1, None)
+        assert not store.save_checkpoint(owner, 1, None), (
+            'Неизменённая контрольная точка не должна перезаписываться.'
+        )
+        store.save_statuses(owner, {1: 'reviewing'})
+        store.save_statuses(owner, {1: 'approved'})
+        assert store.get_status(owner, 1) == 'approved'
+
+    def test_token_is_not_stored(self):
+        import state
+        assert 'sometoken' not in state.owner_key('sometoken')
+
+    def test_fleet_restores_subscriptions(self):
+        import fleet
+        import state
+        store = state.StateStore()
+        store.save_checkpoint(state.owner_key('t1'), 500, 'ошибка')
+        registry = fleet.SubscriptionRegistry()
+        registry.add('t1', 1, timestamp=0)
+        registry.add('t2', 2, timestamp=0)
+        fleet.restore_subscriptions(registry, store)
+        assert registry.get('t1').timestamp == 500
+        assert registry.get('t1').prev_message == 'ошибка'
+        assert registry.get('t2').timestamp == 0
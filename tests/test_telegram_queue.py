@@ -0,0 +1,106 @@
+import pytest
+from telebot.apihelper import ApiTelegramException
+
+
+class RecordingBot:
+    def __init__(self, fail_with=None):
+        self.sent = []
+        self.fail_with = list(fail_with or [])
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        if self.fail_with:
+            raise self.fail_with.pop(0)
+        self.sent.append((chat_id, text))
+
+
+def too_many_requests(retry_after):
+    return ApiTelegramException('send_message', None, {
+        'error_code': 429,
+        'description': 'Too Many Requests',
+        'parameters': {'retry_after': retry_after},
+    })
+
+
+class TestSendQueue:
+
+    def test_chat_rate_limit_delays_burst(self, clock):
+        from telegram_queue import SendQueue
+        bot = RecordingBot()
+        outbox = SendQueue(bot, chat_rate=1, chat_burst=2, clock=clock)
+        results = [outbox.deliver(1, f'm{i}', 0) for i in range(3)]
+        assert results == [True, True, False], (
+            'Сверх лимита чата сообщения должны откладываться.'
+        )
+        assert outbox.deliver(2, 'other chat', 0), (
+            'Лимит одного чата не должен задерживать другие чаты.'
+        )
+        assert len(outbox) == 1
+
+    def test_global_rate_limit(self, clock):
+        from telegram_queue import SendQueue
+        outbox = SendQueue(RecordingBot(), global_rate=2, clock=clock)
+        results = [outbox.deliver(chat, 'm', 0) for chat in range(3)]
+        assert results == [True, True, False]
+
+    def test_retry_after_is_honored(self, clock):
+        from telegram_queue import SendQueue
+        bot = RecordingBot(fail_with=[too_many_requests(7)])
+        outbox = SendQueue(bot, clock=clock)
+        assert not outbox.deliver(1, 'm', 0)
+        clock.now = 7
+        item = outbox._next_item()
+        assert item == (1, 'm', 1, False)
+        assert outbox.deliver(*item)
+        assert bot.sent == [(1, 'm')]
+
+    def test_put_does_not_block_when_full(self):
+        from exceptions import CantSendMessage
+        from telegram_queue import SendQueue
+        outbox = SendQueue(RecordingBot(), maxsize=1)
+        outbox.put(1, 'first')
+        with pytest.raises(CantSendMessage):
+            outbox.put(1, 'second')
+
+    def test_rate_limited_worker_keeps_queue_bounded(self):
+        from exceptions import CantSendMessage
+        from telegram_queue import SendQueue
+        outbox = SendQueue(RecordingBot(), maxsize=10, global_rate=1).start()
+        accepted = 0
+        try:
+            for chat in range(2000):
+                try:
+                    outbox.put(chat % 3, 'm')
+                except CantSendMessage:
+                    continue
+                accepted += 1
+            assert len(outbox) <= 10
+            assert accepted <= 12, (
+                'При ограничении частоты переполненная очередь должна '
+                'отклонять сообщения.'
+            )
+        finally:
+            outbox.stop(timeout=0)
+
+    def test_chat_order_is_kept(self, clock):
+        from telegram_queue import SendQueue
+        bot = RecordingBot()
+        outbox = SendQueue(bot, chat_rate=1, chat_burst=1, clock=clock)
+        for index in range(4):
+            outbox.deliver(1, f'm{index}', 0)
+        assert len(outbox._delayed) == 3
+        for now in range(1, 4):
+            clock.now = now
+            outbox.deliver(*outbox._next_item())
+        assert [text for _, text in bot.sent] == ['m0', 'm1', 'm2', 'm3'], (
+            'Отложенные по лимиту чата сообщения должны уходить по порядку '
+            'и без повторных откладываний.'
+        )
+
+    def test_worker_drains_on_stop(self):
+        from telegram_queue import SendQueue
+        bot = RecordingBot()
+        outbox = SendQueue(bot).start()
+        for chat in range(5):
+            outbox.put(chat, 'm')
+        assert outbox.stop(timeout=1) == 0
+        assert len(bot.sent) == 5
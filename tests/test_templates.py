@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+
+class TestTemplateRegistry:
+
+    def test_render_matches_parse_status(self, homework_module):
+        for status, verdict in homework_module.HOMEWORK_VERDICTS.items():
+            assert homework_module.TEMPLATES.render('hw.zip', status) == (
+                f'Изменился статус проверки работы "hw.zip". {verdict}'
+            )
+
+    def test_rendered_text_is_cached(self, homework_module):
+        from models import Homework
+        templates = homework_module.TEMPLATES
+        templates.render.cache_clear()
+        homework = Homework.from_dict(
+            {'homework_name': 'hw.zip', 'status': 'approved'}
+        )
+        first = homework_module.parse_status(homework)
+        second = homework_module.parse_status(
+            {'homework_name': 'hw.zip', 'status': 'approved'}
+        )
+        assert second is first, (
+            'Повторное сообщение для той же работы и статуса должно '
+            'браться из кэша.'
+        )
+        assert templates.render.cache_info().hits == 1
+
+    def test_unknown_status(self, homework_module):
+        from templates import TemplateRegistry
+        registry = TemplateRegistry()
+        with pytest.raises(KeyError):
+            registry.render('hw.zip', 'unknown')
+        with pytest.raises(homework_module.WrongHomeworkStatus):
+            homework_module.parse_status(
+                {'homework_name': 'hw.zip', 'status': 'on_hold'}
+            )
+
+    def test_verdicts_from_file(self, tmp_path, homework_module):
+        from templates import make_registry
+        path = tmp_path / 'verdicts.json'
+        path.write_text(json.dumps({
+            'ru': {'on_hold': 'Работа {отложена}.'},
+            'en': {
+                'format': '{homework_name}: {verdict}',
+                'approved': 'approved!',
+            },
+        }), encoding='utf-8')
+        registry = make_registry(homework_module.HOMEWORK_VERDICTS, path)
+        assert registry.render('hw.zip', 'on_hold') == (
+            'Изменился статус проверки работы "hw.zip". Работа {отложена}.'
+        )
+        assert registry.render('hw.zip', 'approved', 'en') == (
+            'hw.zip: approved!'
+        )
+        assert registry.render('hw.zip', 'rejected', 'en') == (
+            registry.render('hw.zip', 'rejected')
+        ), 'Без вердикта в локали должен использоваться русский.'
@@ -0,0 +1,69 @@
+import time
+
+import requests
+
+import tests.check_utils as check_utils
+
+
+def make_poller(threads=0, deadline=0.1, delay=0.06):
+    import fleet
+    registry = fleet.SubscriptionRegistry()
+    for token in ('a', 'b', 'c', 'd'):
+        registry.add(token, token)
+    poller = fleet.FleetPoller(
+        None, registry, period=100, threads=threads, deadline=deadline
+    )
+    polled = []
+
+    def poll(subscription):
+        polled.append(subscription.token)
+        time.sleep(delay)
+
+    poller.poll = poll
+    poller.schedule_all(now=0)
+    return poller, polled
+
+
+class TestTimeouts:
+
+    def test_get_api_answer_has_timeout(self, monkeypatch, homework_module):
+        calls = []
+        monkeypatch.setattr(requests, 'get', check_utils.mock_get_with_data(
+            {'homeworks': [], 'current_date': 1}, calls=calls
+        ))
+        homework_module.get_api_answer(0)
+        assert calls[0]['timeout'] == (
+            homework_module.API_CONNECT_TIMEOUT,
+            homework_module.API_READ_TIMEOUT,
+        ), 'Запрос к api-сервису должен выполняться с таймаутами.'
+
+    def test_sequential_polls_stop_at_deadline(self):
+        import metrics
+        cancelled = metrics.POLLS_CANCELLED.value()
+        poller, polled = make_poller()
+        poller.run_pending(now=100)
+        assert polled == ['a', 'b'], (
+            'После дедлайна цикла новые опросы не должны начинаться.'
+        )
+        assert metrics.POLLS_CANCELLED.value() == cancelled + 2
+        assert [token for _, token in sorted(poller._queue)[:2]] == [
+            'c', 'd'
+        ], 'Отложенные подписки должны остаться первыми в очереди.'
+
+    def test_pool_cancels_not_started_polls(self):
+        poller, polled = make_poller(threads=2, delay=0.2)
+        started = time.monotonic()
+        poller.run_pending(now=100)
+        assert time.monotonic() - started < 0.2, (
+            'Цикл в пуле должен завершаться по дедлайну.'
+        )
+        poller.close()
+        assert sorted(polled) == ['a', 'b']
+        assert len(poller._queue) == 4
+
+    def test_overrun_is_counted(self, homework_module):
+        import metrics
+        overruns = metrics.CYCLE_OVERRUNS.value()
+        homework_module.observe_cycle(time.monotonic() - 2, deadline=1)
+        homework_module.observe_cycle(time.monotonic(), deadline=1)
+        assert metrics.CYCLE_OVERRUNS.value() == overruns + 1